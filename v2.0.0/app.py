@@ -14,8 +14,11 @@ import logging
 # Add utils to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from config import PAGE_CONFIG, get_theme_css
-from utils.data_loader import load_data_from_s3, merge_data_for_dashboard, calculate_kpis, get_latest_file_info
+from config import PAGE_CONFIG, get_theme_css, DATA_WINDOW_OPTIONS, DEFAULT_DATA_WINDOW
+from utils.data_loader import (
+    load_data_from_s3, merge_data_for_dashboard, calculate_kpis, get_latest_file_info,
+    get_data_version, get_data_cutoff
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -34,6 +37,10 @@ def configure_page():
     if 'data_loaded' not in st.session_state:
         st.session_state.data_loaded = False
     
+    # History window persists across pages (widget keys are dropped on other pages)
+    if 'data_window' not in st.session_state:
+        st.session_state.data_window = DEFAULT_DATA_WINDOW
+    
     # Apply theme-specific CSS
     from config import get_theme_css
     st.markdown(get_theme_css(st.session_state.theme), unsafe_allow_html=True)
@@ -58,10 +65,26 @@ def main():
         
         st.markdown("---")
         
-        # Load data
+        # History window: only questions from the cutoff onward are read from S3
+        windows = list(DATA_WINDOW_OPTIONS)
+        selected_window = st.sidebar.selectbox(
+            "🗓️ History Window",
+            windows,
+            index=windows.index(st.session_state.data_window),
+            help="Load only recent questions; shorter windows load faster"
+        )
+        if selected_window != st.session_state.data_window:
+            st.session_state.data_window = selected_window
+            st.session_state.data_loaded = False
+        since = get_data_cutoff()
+        
+        # Load data (spinner only on cold loads; reruns are served from cache)
         try:
-            with st.spinner("🔄 Loading data from AWS S3..."):
-                data = load_data_from_s3()
+            if st.session_state.data_loaded:
+                data = load_data_from_s3(since)
+            else:
+                with st.spinner("🔄 Loading data from AWS S3..."):
+                    data = load_data_from_s3(since)
         except Exception as e:
             st.error(f"❌ **Error loading data from S3:** {str(e)}")
             logger.error(f"S3 data loading error: {e}", exc_info=True)
@@ -81,20 +104,23 @@ def main():
             """)
             st.stop()
         
-        # Merge data for dashboard
-        merged_df = merge_data_for_dashboard(data)
+        # Merge data for dashboard (cached per S3 snapshot, so reruns skip the joins)
+        data_version = get_data_version(since)
+        merged_df = merge_data_for_dashboard(data, data_version)
         
         if merged_df.empty:
             st.warning("⚠️ No question data available in the loaded files.")
             st.stop()
         
         # Calculate KPIs
-        kpis = calculate_kpis(merged_df, data)
+        kpis = calculate_kpis(merged_df, data, data_version)
         
         # Store in session state for use in other pages (always update to ensure fresh data)
         st.session_state['merged_df'] = merged_df
         st.session_state['raw_data'] = data
         st.session_state['kpis'] = kpis
+        st.session_state['data_version'] = data_version
+        st.session_state.data_loaded = True
         
         # Success message
         file_info = get_latest_file_info()
@@ -3,6 +3,8 @@ Configuration settings for BYU Pathway Missionary Question Analysis Dashboard v2
 """
 
 import os
+import re
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -190,9 +192,32 @@ SORT_OPTIONS = {
 # ============ Cache Settings ============
 CACHE_TTL = 3600  # Cache data for 1 hour (in seconds)
 
+# ============ Data Window ============
+# History windows offered in the sidebar (days of questions to load; None = full history).
+# The cutoff is pushed into the parquet read so older row groups are never downloaded.
+DATA_WINDOW_OPTIONS = {
+    "All time": None,
+    "Last 365 days": 365,
+    "Last 90 days": 90,
+    "Last 30 days": 30,
+}
+DEFAULT_DATA_WINDOW = "All time"
+
 # ============ Styling ============
+@lru_cache(maxsize=None)
 def get_theme_css(theme='light'):
-    """Get theme-specific CSS"""
+    """
+    Get theme-specific CSS.
+    Built once per theme with comments and indentation stripped, since every page
+    re-sends it to the browser on each rerun.
+    """
+    css = _theme_css_source(theme)
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)
+    return re.sub(r'\s+', ' ', css).strip()
+
+
+def _theme_css_source(theme='light'):
+    """Readable theme-specific CSS source"""
     if theme == 'dark':
         return """
 <style>
@@ -38,7 +38,8 @@ def main():
 
     ensure_data_loaded()
 
-    df = st.session_state['merged_df'].copy()
+    # Read-only reference; the calendar subset below is copied before it is modified
+    df = st.session_state['merged_df']
 
     if df.empty:
         st.warning("No data available.")
@@ -4,15 +4,18 @@ Cost & Performance Page - Cost evaluation, latency analysis, and operational met
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 import sys
 from pathlib import Path
+from typing import Optional
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config import PAGE_CONFIG, get_theme_css, BYU_COLORS, CHART_COLOR_PALETTE
 from utils.data_loader import ensure_data_loaded
+from utils.visualizations import histogram_bar, show_figure
 
 # Configure page settings (needed for direct page access)
 st.set_page_config(**PAGE_CONFIG)
@@ -22,16 +25,564 @@ if 'theme' not in st.session_state:
     st.session_state.theme = 'light'
 st.markdown(get_theme_css(st.session_state.theme), unsafe_allow_html=True)
 
+LATENCY_PERCENTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+def _week_keys(ts: pd.Series) -> pd.Series:
+    """
+    Integer YYYYWW keys for a parsed timestamp column.
+    Matches strftime('%Y-W%U') (Sunday-start weeks) without formatting every row.
+    """
+    days_since_sunday = (ts.dt.dayofweek + 1) % 7
+    week = (ts.dt.dayofyear - 1 + 7 - days_since_sunday) // 7
+    return (ts.dt.year * 100 + week).astype('Int64')
+
+
+def _week_label(key) -> str:
+    """Format a YYYYWW key as the 'YYYY-Www' label shown on the charts."""
+    return f"{key // 100}-W{key % 100:02d}"
+
+
+def _latency_summary(lat: pd.Series, key: pd.Series) -> pd.DataFrame:
+    """
+    Average, median, P95 and count of latency per group, in first-seen group order.
+    Uses groupby.quantile rather than a per-group lambda so P95 stays vectorized.
+    """
+    grouped = lat.groupby(key, sort=False)
+    summary = grouped.agg(avg_latency='mean', median_latency='median')
+    summary['p95_latency'] = grouped.quantile(0.95)
+    summary['count'] = grouped.count()
+    return summary
+
+
+def _latency_percentiles(lat: pd.Series) -> dict:
+    """
+    P50/P90/P95/P99 of the latency values in a single np.quantile pass.
+    Shared by the KPI cards, the percentile vlines and the percentile summary.
+    """
+    arr = lat.to_numpy()
+    if arr.size == 0:
+        return dict.fromkeys(LATENCY_PERCENTILES, np.nan)
+    return dict(zip(LATENCY_PERCENTILES, np.quantile(arr, LATENCY_PERCENTILES)))
+
+
+def _kpi_row(items: list):
+    """
+    One row of st.metric cards from a list of st.metric keyword dicts.
+    A None item leaves its column empty.
+    """
+    for col, item in zip(st.columns(len(items)), items):
+        if item is not None:
+            col.metric(**item)
+
+
+def _time_aggregates(df: pd.DataFrame, data_version) -> dict:
+    """
+    Weekly cost and daily/weekly latency aggregates, cached per data_version.
+    The frame is not hashed, so without a data_version they are computed uncached.
+    """
+    if data_version is None:
+        return _compute_time_aggregates(df)
+    return _cached_time_aggregates(df, data_version)
+
+
+@st.cache_data(ttl=3600, max_entries=4, show_spinner=False)
+def _cached_time_aggregates(_df: pd.DataFrame, data_version) -> dict:
+    """_compute_time_aggregates keyed by data_version (set by the data loader)."""
+    return _compute_time_aggregates(_df)
+
+
+def _compute_time_aggregates(df: pd.DataFrame) -> dict:
+    """Weekly cost and daily/weekly latency aggregates used by the charts on this page."""
+    aggs = {}
+    # Integer week keys, grouped unsorted; each (small) result is sorted once afterwards
+    week_key = _week_keys(df['timestamp'])
+
+    if 'total_cost' in df.columns:
+        cost_mask = df['_has_cost']
+        weekly_cost = df.loc[cost_mask, 'total_cost'].groupby(week_key[cost_mask], sort=False).agg(
+            total_cost='sum',
+            question_count='count',
+            avg_cost='mean',
+            max_cost='max'
+        ).rename_axis('week').reset_index().sort_values('week', ignore_index=True)
+        weekly_cost['week'] = weekly_cost['week'].map(_week_label)
+        aggs['weekly_cost'] = weekly_cost
+
+    if 'latency' in df.columns:
+        lat_mask = df['_has_latency']
+        lat = df.loc[lat_mask, 'latency']
+        # Group daily on datetime64 midnights (int64 keys) and convert only the result to dates
+        daily_lat = _latency_summary(lat, df.loc[lat_mask, 'timestamp'].dt.floor('D'))
+        daily_lat = daily_lat.rename_axis('date').reset_index().sort_values('date', ignore_index=True)
+        daily_lat['date'] = daily_lat['date'].dt.date
+        aggs['daily_lat'] = daily_lat
+        weekly_lat = _latency_summary(lat, week_key[lat_mask]).rename_axis('week').reset_index()
+        weekly_lat = weekly_lat.sort_values('week', ignore_index=True)
+        weekly_lat['week'] = weekly_lat['week'].map(_week_label)
+        aggs['weekly_lat'] = weekly_lat
+
+    return aggs
+
+
+def _weekly_cost_figure(weekly_cost: pd.DataFrame) -> go.Figure:
+    """Weekly cost bar chart with per-week question counts in the hover."""
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=weekly_cost['week'].to_numpy(),
+        y=weekly_cost['total_cost'].to_numpy(),
+        name='Weekly Cost',
+        marker=dict(color=BYU_COLORS['primary']),
+        text=[f"${c:.4f}" for c in weekly_cost['total_cost']],
+        textposition='outside',
+        hovertemplate='<b>%{x}</b><br>Cost: $%{y:.6f}<br>Questions: %{customdata[0]}<br>Avg: $%{customdata[1]:.6f}<extra></extra>',
+        customdata=weekly_cost[['question_count', 'avg_cost']].to_numpy(dtype='float32')
+    ))
+
+    fig.update_layout(
+        title="Weekly Cost",
+        xaxis_title="Week",
+        yaxis_title="Total Cost ($)",
+        height=400,
+        showlegend=False
+    )
+    return fig
+
+
+def _cumulative_cost_figure(cost_df: pd.DataFrame) -> go.Figure:
+    """Running total of cost over time."""
+    cost_time = cost_df.sort_values('timestamp')
+    cost_time['cumulative_cost'] = cost_time['total_cost'].cumsum()
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        # Format the time axis once rather than having Plotly stringify each datetime
+        x=cost_time['timestamp'].dt.strftime('%Y-%m-%d %H:%M').to_numpy(),
+        y=cost_time['cumulative_cost'].to_numpy(),
+        mode='lines',
+        fill='tozeroy',
+        line=dict(color=BYU_COLORS['primary'], width=2),
+        fillcolor='rgba(0, 46, 93, 0.1)',
+        hovertemplate='%{x}<br>Cumulative: $%{y:.6f}<extra></extra>'
+    ))
+
+    fig.update_layout(
+        title="Cumulative Cost",
+        xaxis_title="Time",
+        yaxis_title="Cumulative Cost ($)",
+        height=400,
+        showlegend=False
+    )
+    return fig
+
+
+def _cost_distribution_figure(cost_df: pd.DataFrame) -> go.Figure:
+    """Per-question cost histogram."""
+    fig = go.Figure()
+    fig.add_trace(histogram_bar(
+        cost_df['total_cost'],
+        marker=dict(color=BYU_COLORS['accent1']),
+        hovertemplate='Cost: $%{x:.6f}<br>Count: %{y}<extra></extra>'
+    ))
+
+    fig.update_layout(
+        title="Cost Distribution (per question)",
+        xaxis_title="Cost ($)",
+        yaxis_title="Number of Questions",
+        height=350,
+        showlegend=False
+    )
+    return fig
+
+
+def _latency_distribution_figure(lat_df: pd.DataFrame, lat_pcts: dict) -> go.Figure:
+    """Latency histogram with P50/P95/P99 markers."""
+    fig = go.Figure()
+    fig.add_trace(histogram_bar(
+        lat_df['latency'],
+        marker=dict(color=BYU_COLORS['secondary']),
+        hovertemplate='Latency: %{x:.2f}s<br>Count: %{y}<extra></extra>'
+    ))
+
+    # Add percentile lines
+    p50, p95, p99 = lat_pcts[0.5], lat_pcts[0.95], lat_pcts[0.99]
+
+    for pval, plabel, pcolor in [
+        (p50, 'P50 (Median)', '#4caf50'),
+        (p95, 'P95', '#FFB933'),
+        (p99, 'P99', '#C5050C')
+    ]:
+        fig.add_vline(
+            x=pval, line_dash="dash", line_color=pcolor,
+            annotation_text=f"{plabel}: {pval:.2f}s",
+            annotation_position="top right"
+        )
+
+    fig.update_layout(
+        title="Latency Distribution",
+        xaxis_title="Latency (seconds)",
+        yaxis_title="Number of Questions",
+        height=400,
+        showlegend=False
+    )
+    return fig
+
+
+def _daily_latency_figure(daily_lat: pd.DataFrame) -> go.Figure:
+    """Daily average, median and P95 latency."""
+    daily_dates = daily_lat['date'].to_numpy()
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=daily_dates, y=daily_lat['avg_latency'].to_numpy(),
+        name='Average', mode='lines+markers',
+        line=dict(color=BYU_COLORS['primary'], width=2),
+        hovertemplate='%{x}<br>Avg: %{y:.3f}s<extra></extra>'
+    ))
+    fig.add_trace(go.Scatter(
+        x=daily_dates, y=daily_lat['median_latency'].to_numpy(),
+        name='Median', mode='lines+markers',
+        line=dict(color='#4caf50', width=2),
+        hovertemplate='%{x}<br>Median: %{y:.3f}s<extra></extra>'
+    ))
+    fig.add_trace(go.Scatter(
+        x=daily_dates, y=daily_lat['p95_latency'].to_numpy(),
+        name='P95', mode='lines+markers',
+        line=dict(color=BYU_COLORS['accent2'], width=2, dash='dash'),
+        hovertemplate='%{x}<br>P95: %{y:.3f}s<extra></extra>'
+    ))
+
+    fig.update_layout(
+        title="Daily Latency Trend",
+        xaxis_title="Date",
+        yaxis_title="Latency (seconds)",
+        height=400,
+        hovermode='x unified',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    return fig
+
+
+def _weekly_latency_figure(weekly_lat: pd.DataFrame) -> go.Figure:
+    """Weekly average latency bars with the P95 line."""
+    weekly_weeks = weekly_lat['week'].to_numpy()
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=weekly_weeks, y=weekly_lat['avg_latency'].to_numpy(),
+        name='Average',
+        marker=dict(color=BYU_COLORS['primary']),
+        hovertemplate='<b>%{x}</b><br>Avg: %{y:.3f}s<br>Count: %{customdata}<extra></extra>',
+        customdata=weekly_lat['count'].to_numpy()
+    ))
+    fig.add_trace(go.Scatter(
+        x=weekly_weeks, y=weekly_lat['p95_latency'].to_numpy(),
+        name='P95',
+        mode='lines+markers',
+        line=dict(color=BYU_COLORS['accent2'], width=2),
+        hovertemplate='<b>%{x}</b><br>P95: %{y:.3f}s<extra></extra>'
+    ))
+
+    fig.update_layout(
+        title="Weekly Latency",
+        xaxis_title="Week",
+        yaxis_title="Latency (seconds)",
+        height=400,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    return fig
+
+
+def _source_latency_figure(source_df: pd.DataFrame, label_map: dict) -> go.Figure:
+    """Overlaid latency histograms, one per answer path, on shared bins."""
+    fig = go.Figure()
+    colors = [BYU_COLORS['primary'], BYU_COLORS['accent2'], BYU_COLORS['secondary'], BYU_COLORS['accent1']]
+    edges = np.histogram_bin_edges(source_df.loc[source_df['_has_latency'], 'latency'].to_numpy(), bins=30)
+    for idx, (source_type, group) in enumerate(source_df.groupby('source_type')):
+        lat_vals = group.loc[group['_has_latency'], 'latency']
+        if len(lat_vals) == 0:
+            continue
+        fig.add_trace(histogram_bar(
+            lat_vals,
+            bins=edges,
+            name=label_map.get(source_type, source_type.replace('_', ' ').title()),
+            marker=dict(color=colors[idx % len(colors)]),
+            opacity=0.7
+        ))
+    fig.update_layout(
+        title="Latency Distribution by Answer Path",
+        xaxis_title="Latency (seconds)",
+        yaxis_title="Count",
+        barmode='overlay', height=350,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    return fig
+
+
+def _cost_volume_figure(weekly_cost: pd.DataFrame) -> go.Figure:
+    """Weekly total cost against weekly question volume."""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=weekly_cost['question_count'].to_numpy(),
+        y=weekly_cost['total_cost'].to_numpy(),
+        mode='markers+text',
+        text=weekly_cost['week'].to_numpy(),
+        textposition='top center',
+        marker=dict(
+            color=BYU_COLORS['primary'],
+            size=12,
+            line=dict(width=1, color='white')
+        ),
+        hovertemplate='<b>%{text}</b><br>Questions: %{x}<br>Cost: $%{y:.6f}<extra></extra>'
+    ))
+
+    fig.update_layout(
+        title="Cost vs Question Volume (by Week)",
+        xaxis_title="Number of Questions",
+        yaxis_title="Total Cost ($)",
+        height=400,
+        showlegend=False
+    )
+    return fig
+
+
+@st.fragment
+def _render_cost_tab(cost_df: pd.DataFrame, weekly_cost: Optional[pd.DataFrame], data_version=None):
+    """Cost Analysis tab: weekly breakdown, cumulative cost and cost distribution."""
+    st.markdown("### 💰 Weekly Cost Breakdown")
+
+    if weekly_cost is not None:
+        show_figure("weekly_cost_bar", data_version, _weekly_cost_figure, weekly_cost)
+
+        # Weekly cost table
+        with st.expander("📋 Weekly Cost Details"):
+            display_weekly = weekly_cost.copy()
+            display_weekly.columns = ['Week', 'Total Cost ($)', 'Questions', 'Avg Cost ($)', 'Max Cost ($)']
+            st.dataframe(display_weekly, width='stretch', hide_index=True)
+
+    st.divider()
+
+    # Cumulative cost
+    st.markdown("### 📈 Cumulative Cost Over Time")
+    if 'timestamp' in cost_df.columns:
+        show_figure("cumulative_cost_line", data_version, _cumulative_cost_figure, cost_df)
+
+    st.divider()
+
+    # Cost distribution
+    st.markdown("### 📊 Cost Distribution")
+    show_figure("cost_distribution_hist", data_version, _cost_distribution_figure, cost_df)
+
+    # Cost summary stats
+    with st.expander("📊 Cost Statistics"):
+        costs = cost_df['total_cost']
+        _kpi_row([
+            dict(label="Min", value=f"${costs.min():.8f}"),
+            dict(label="Median", value=f"${costs.median():.6f}"),
+            dict(label="Mean", value=f"${costs.mean():.6f}"),
+            dict(label="Max", value=f"${costs.max():.6f}"),
+        ])
+
+
+@st.fragment
+def _render_latency_tab(lat_df: pd.DataFrame, lat_pcts: dict,
+                        daily_lat: Optional[pd.DataFrame], weekly_lat: Optional[pd.DataFrame],
+                        data_version=None):
+    """Latency Analysis tab: distribution, percentiles and daily/weekly trends."""
+    st.markdown("### ⚡ Latency Distribution")
+
+    show_figure("latency_distribution_hist", data_version, _latency_distribution_figure, lat_df, lat_pcts)
+
+    # Percentile summary
+    st.markdown("### 📊 Latency Percentiles")
+    with st.expander("ℹ️ What do P50, P95, P99 mean?"):
+        st.markdown("""
+        These are **percentiles** — they tell you how fast the chatbot responds for most users.
+
+        - **P50 (Median):** Half of all responses are faster than this.
+        - **P95:** 95% of responses are faster — only 1 in 20 is slower.
+        - **P99:** 99% of responses are faster — only the rare slowest 1%.
+
+        Lower is better. If P95 is high, some users are waiting a long time.
+        """)
+    _kpi_row([
+        dict(label="Min", value=f"{lat_df['latency'].min():.3f}s"),
+        dict(label="P50 (Median)", value=f"{lat_pcts[0.5]:.3f}s"),
+        dict(label="P90", value=f"{lat_pcts[0.9]:.3f}s"),
+        dict(label="P95", value=f"{lat_pcts[0.95]:.3f}s"),
+        dict(label="P99", value=f"{lat_pcts[0.99]:.3f}s"),
+    ])
+
+    st.divider()
+
+    # Latency over time
+    st.markdown("### 📈 Latency Trend Over Time")
+    if daily_lat is not None:
+        show_figure("latency_trend_line", data_version, _daily_latency_figure, daily_lat)
+
+    st.divider()
+
+    # Weekly latency breakdown
+    st.markdown("### 📅 Weekly Latency Summary")
+    if weekly_lat is not None:
+        show_figure("weekly_latency_bar", data_version, _weekly_latency_figure, weekly_lat)
+
+
+def _render_answer_paths(df: pd.DataFrame, has_cost: bool, has_latency: bool, data_version=None):
+    """Answer path comparison: per-source volume, latency and cost, and latency by path."""
+    st.markdown("#### 🧭 Answer Path Comparison")
+    with st.expander("ℹ️ What are these answer paths?"):
+        st.markdown("""
+        **RAG (Retrieval-Augmented Generation)** is the default path — the chatbot searches a knowledge base
+        and uses AI to write a custom answer. Most questions go through RAG.
+
+        **Calendar Pipeline** is a specialized path for date-related questions (e.g., "When does Block 3 start?").
+        Instead of searching the knowledge base, it looks up the academic calendar directly and returns
+        a structured calendar card. Calendar questions are typically slower (more steps) but more accurate for dates.
+
+        **Tuition** is the calculator path for rate and full-degree journey questions. It uses the tuition card
+        data instead of relying only on retrieved text.
+        """)
+
+    label_map = {
+        'rag': 'RAG',
+        'calendar': 'Calendar',
+        'tuition': 'Tuition',
+        'tuition_journey': 'Tuition Journey',
+        'draft_edit': 'Draft Edit',
+    }
+    # Only the columns this section reads; the frame is released when the helper returns
+    metric_cols = [c for c, used in (('latency', has_latency), ('_has_latency', has_latency),
+                                     ('total_cost', has_cost), ('_has_cost', has_cost)) if used]
+    source_df = df[metric_cols].assign(source_type=df['source_type'].fillna('rag').astype(str).str.lower())
+    is_rag = source_df['source_type'] == 'rag'
+
+    # Rows are ordered by question count below, so the groups need no key sort
+    summary_rows = []
+    for source_type, group in source_df.groupby('source_type', sort=False):
+        row = {
+            'Answer Path': label_map.get(source_type, source_type.replace('_', ' ').title()),
+            'Questions': len(group),
+        }
+        if has_latency:
+            lat = group.loc[group['_has_latency'], 'latency']
+            row['Avg Latency (s)'] = round(lat.mean(), 2) if len(lat) > 0 else None
+            row['P95 Latency (s)'] = round(lat.quantile(0.95), 2) if len(lat) > 0 else None
+        if has_cost:
+            cost = group.loc[group['_has_cost'], 'total_cost']
+            row['Avg Cost ($)'] = round(cost.mean(), 6) if len(cost) > 0 else None
+            row['Total Cost ($)'] = round(cost.sum(), 6) if len(cost) > 0 else 0
+        summary_rows.append(row)
+
+    source_summary = pd.DataFrame(summary_rows).sort_values('Questions', ascending=False)
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        rag_count = int(is_rag.sum())
+        st.metric("RAG Questions", f"{rag_count:,}")
+        specialized = len(source_df) - rag_count
+        st.metric("Specialized Cards", f"{specialized:,}")
+
+    with col2:
+        if has_latency:
+            lat_pos = source_df['_has_latency']
+            rag_lat = source_df.loc[is_rag & lat_pos, 'latency']
+            specialized_lat = source_df.loc[~is_rag & lat_pos, 'latency']
+            st.metric("RAG Avg Latency",
+                      f"{rag_lat.mean():.2f}s" if len(rag_lat) > 0 else "N/A")
+            st.metric("Specialized Avg Latency",
+                      f"{specialized_lat.mean():.2f}s" if len(specialized_lat) > 0 else "N/A")
+
+    with col3:
+        if has_cost:
+            cost_pos = source_df['_has_cost']
+            rag_cost = source_df.loc[is_rag & cost_pos, 'total_cost']
+            specialized_cost = source_df.loc[~is_rag & cost_pos, 'total_cost']
+            st.metric("RAG Avg Cost",
+                      f"${rag_cost.mean():.6f}" if len(rag_cost) > 0 else "N/A")
+            st.metric("Specialized Avg Cost",
+                      f"${specialized_cost.mean():.6f}" if len(specialized_cost) > 0 else "N/A")
+
+    st.dataframe(source_summary, width='stretch', hide_index=True)
+
+    # Side-by-side latency distributions
+    if has_latency and source_df['source_type'].nunique() > 1:
+        show_figure("rag_vs_cal_latency", data_version, _source_latency_figure, source_df, label_map)
+
+    st.divider()
+
+
+@st.fragment
+def _render_operational_tab(df: pd.DataFrame, cost_series: Optional[pd.Series],
+                            lat_series: Optional[pd.Series], weekly_cost: Optional[pd.DataFrame],
+                            data_version=None):
+    """Operational Overview tab: answer path comparison, cost vs volume and efficiency."""
+    has_cost = cost_series is not None
+    has_latency = lat_series is not None
+
+    st.markdown("### 📊 Operational Overview")
+
+    # Source comparison
+    if 'source_type' in df.columns and (has_cost or has_latency):
+        _render_answer_paths(df, has_cost, has_latency, data_version)
+
+    # Cost vs Volume correlation
+    if has_cost and weekly_cost is not None:
+        st.markdown("#### 💰 Cost vs Question Volume")
+
+        show_figure("cost_vs_volume_scatter", data_version, _cost_volume_figure, weekly_cost)
+
+    st.divider()
+
+    # Efficiency insights
+    if has_cost and has_latency:
+        st.markdown("#### 💡 Efficiency Insights")
+
+        cost_data = cost_series
+        lat_data = lat_series
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown("**Cost Efficiency:**")
+            if len(cost_data) > 0:
+                st.markdown(f"- **Total spend:** ${cost_data.sum():.4f}")
+                st.markdown(f"- **Cost per question:** ${cost_data.mean():.6f} avg")
+                if cost_data.sum() > 0:
+                    daily_rate = cost_data.sum() / max(1, (df['timestamp'].max() - df['timestamp'].min()).days)
+                    monthly_estimate = daily_rate * 30
+                    st.markdown(f"- **Estimated monthly:** ${monthly_estimate:.4f}")
+
+        with col2:
+            st.markdown("**Latency Performance:**")
+            if len(lat_data) > 0:
+                fast_count = (lat_data < 3.0).sum()
+                fast_pct = fast_count / len(lat_data) * 100
+                st.markdown(f"- **Under 3s:** {fast_count} ({fast_pct:.1f}%)")
+                slow_count = (lat_data > 10.0).sum()
+                slow_pct = slow_count / len(lat_data) * 100
+                st.markdown(f"- **Over 10s:** {slow_count} ({slow_pct:.1f}%)")
+                st.markdown(f"- **Avg response:** {lat_data.mean():.2f}s")
+
+        with st.expander("ℹ️ Reading these numbers"):
+            st.markdown("""
+            - **Cost** is what we pay the AI provider (OpenAI) per question. Most questions cost a fraction of a cent.
+            - **Latency** is how long the user waits for a response. This is end-to-end time including
+              retrieval, AI processing, and streaming.
+            - Calendar questions tend to cost slightly more and take longer because they involve multiple
+              steps (intent detection, date extraction, card building).
+            """)
+
 
 def main():
     st.title("💰 Cost & Performance")
     st.markdown("*Monitor spending, latency, and operational efficiency*")
-    st.markdown("---")
+    st.divider()
 
     # Ensure data is loaded
     ensure_data_loaded()
 
-    df = st.session_state['merged_df'].copy()
+    # Read-only reference; blocks that add columns copy their own subset
+    df = st.session_state['merged_df']
 
     if df.empty:
         st.warning("⚠️ No data available.")
@@ -54,87 +605,80 @@ def main():
         """)
         st.stop()
 
+    # Positive-value masks and latency percentiles, computed once and shared
+    # by the KPI cards and every tab below
+    # (_has_cost/_has_latency are the > 0 flags added by merge_data_for_dashboard)
+    cost_mask = df['_has_cost'] if has_cost else None
+    lat_mask = df['_has_latency'] if has_latency else None
+    cost_series = df.loc[cost_mask, 'total_cost'] if has_cost else None
+    lat_series = df.loc[lat_mask, 'latency'] if has_latency else None
+    lat_pcts = _latency_percentiles(lat_series) if has_latency else {}
+
+    # Weekly/daily aggregates for all three tabs, cached per data snapshot
+    # (timestamp is already datetime64, parsed once in merge_data_for_dashboard)
+    has_timestamp = 'timestamp' in df.columns
+    data_version = st.session_state.get('data_version')
+    aggs = _time_aggregates(df, data_version) if has_timestamp else {}
+
     # ── KPI Cards ──
     st.markdown("## 📊 Key Metrics")
 
-    col1, col2, col3, col4 = st.columns(4)
-
-    with col1:
-        if has_cost:
-            # Sum only real costs (> 0). Traces fetched without the Langfuse
-            # 'metrics' field group carry total_cost = -1.0 (a sentinel, not a
-            # cost); summing those raw drove this KPI negative. Every other cost
-            # metric on this page already filters > 0 — this one now matches.
-            total_cost = df[df['total_cost'] > 0]['total_cost'].sum()
-            st.metric(
-                label="💰 Total Cost",
-                value=f"${total_cost:.4f}",
-                help="Total cost across all traces (real costs only; -1 sentinels excluded)"
-            )
-
-    with col2:
-        if has_cost:
-            cost_per_q = df[df['total_cost'] > 0]['total_cost'].mean()
-            st.metric(
-                label="📊 Avg Cost / Question",
-                value=f"${cost_per_q:.6f}" if pd.notna(cost_per_q) else "N/A",
-                help="Average cost per question (non-zero only)"
-            )
-
-    with col3:
-        if has_latency:
-            nonzero_lat = df[df['latency'] > 0]['latency']
-            avg_lat = nonzero_lat.mean() if len(nonzero_lat) > 0 else 0
-            st.metric(
-                label="⚡ Avg Latency",
-                value=f"{avg_lat:.2f}s" if avg_lat > 0 else "N/A",
-                help="Average response time (non-zero only)"
-            )
-
-    with col4:
-        if has_latency:
-            nonzero_lat = df[df['latency'] > 0]['latency']
-            p95 = nonzero_lat.quantile(0.95) if len(nonzero_lat) > 0 else 0
-            st.metric(
-                label="📈 P95 Latency",
-                value=f"{p95:.2f}s" if p95 > 0 else "N/A",
-                help="95th percentile response time"
-            )
+    # Cards for missing metrics are left as None so the grid keeps its positions
+    total_cost = cost_series.sum() if has_cost else None
+    cost_per_q = cost_series.mean() if has_cost else None
+    avg_lat = (lat_series.mean() if len(lat_series) > 0 else 0) if has_latency else None
+    p95 = lat_pcts.get(0.95, 0)
+    median_lat = lat_pcts.get(0.5, 0)
+    p99 = lat_pcts.get(0.99, 0)
+
+    _kpi_row([
+        # Sum only real costs (> 0). Traces fetched without the Langfuse
+        # 'metrics' field group carry total_cost = -1.0 (a sentinel, not a
+        # cost); summing those raw drove this KPI negative. Every other cost
+        # metric on this page already filters > 0 — this one now matches.
+        dict(
+            label="💰 Total Cost",
+            value=f"${total_cost:.4f}",
+            help="Total cost across all traces (real costs only; -1 sentinels excluded)"
+        ) if has_cost else None,
+        dict(
+            label="📊 Avg Cost / Question",
+            value=f"${cost_per_q:.6f}" if pd.notna(cost_per_q) else "N/A",
+            help="Average cost per question (non-zero only)"
+        ) if has_cost else None,
+        dict(
+            label="⚡ Avg Latency",
+            value=f"{avg_lat:.2f}s" if avg_lat > 0 else "N/A",
+            help="Average response time (non-zero only)"
+        ) if has_latency else None,
+        dict(
+            label="📈 P95 Latency",
+            value=f"{p95:.2f}s" if p95 > 0 else "N/A",
+            help="95th percentile response time"
+        ) if has_latency else None,
+    ])
 
     # Second row of KPIs
-    col5, col6, col7 = st.columns(3)
-
-    with col5:
-        if has_cost:
-            questions_with_cost = df[df['total_cost'] > 0].shape[0]
-            st.metric(
-                label="📋 Traces with Cost",
-                value=f"{questions_with_cost:,}",
-                delta=f"{questions_with_cost / len(df) * 100:.1f}% of total",
-                help="Number of traces that have cost data"
-            )
-
-    with col6:
-        if has_latency:
-            nonzero_lat = df[df['latency'] > 0]['latency']
-            median_lat = nonzero_lat.median() if len(nonzero_lat) > 0 else 0
-            st.metric(
-                label="⏱️ Median Latency",
-                value=f"{median_lat:.2f}s" if median_lat > 0 else "N/A",
-                help="Median response time"
-            )
-
-    with col7:
-        if has_latency:
-            nonzero_lat = df[df['latency'] > 0]['latency']
-            p99 = nonzero_lat.quantile(0.99) if len(nonzero_lat) > 0 else 0
-            st.metric(
-                label="🔴 P99 Latency",
-                value=f"{p99:.2f}s" if p99 > 0 else "N/A",
-                help="99th percentile response time"
-            )
+    _kpi_row([
+        dict(
+            label="📋 Traces with Cost",
+            value=f"{len(cost_series):,}",
+            delta=f"{len(cost_series) / len(df) * 100:.1f}% of total",
+            help="Number of traces that have cost data"
+        ) if has_cost else None,
+        dict(
+            label="⏱️ Median Latency",
+            value=f"{median_lat:.2f}s" if median_lat > 0 else "N/A",
+            help="Median response time"
+        ) if has_latency else None,
+        dict(
+            label="🔴 P99 Latency",
+            value=f"{p99:.2f}s" if p99 > 0 else "N/A",
+            help="99th percentile response time"
+        ) if has_latency else None,
+    ])
 
-    st.markdown("---")
+    st.divider()
 
     # ── Tabs ──
     tab1, tab2, tab3 = st.tabs([
@@ -144,439 +688,38 @@ def main():
     ])
 
     # ── TAB 1: Cost Analysis ──
+    # Each tab body is a fragment so interactions inside it rerun only that tab.
+    # Fragments keep their arguments for those reruns, so pass only the columns they read.
+    cost_tab_cols = [c for c in ('timestamp', 'total_cost') if c in df.columns]
     with tab1:
         if not has_cost:
             st.info("No cost data available in the current dataset.")
+        elif cost_series.empty:
+            st.info("No positive-cost traces in the current dataset.")
         else:
-            cost_df = df[df['total_cost'].notna() & (df['total_cost'] > 0)].copy()
-
-            st.markdown("### 💰 Weekly Cost Breakdown")
-
-            if 'timestamp' in cost_df.columns:
-                cost_df['week'] = pd.to_datetime(cost_df['timestamp'], format='ISO8601', errors='coerce').dt.strftime('%Y-W%U')
-                weekly_cost = cost_df.groupby('week').agg(
-                    total_cost=('total_cost', 'sum'),
-                    question_count=('total_cost', 'count'),
-                    avg_cost=('total_cost', 'mean'),
-                    max_cost=('total_cost', 'max')
-                ).reset_index().sort_values('week')
-
-                fig = go.Figure()
-                fig.add_trace(go.Bar(
-                    x=weekly_cost['week'],
-                    y=weekly_cost['total_cost'],
-                    name='Weekly Cost',
-                    marker=dict(color=BYU_COLORS['primary']),
-                    text=[f"${c:.4f}" for c in weekly_cost['total_cost']],
-                    textposition='outside',
-                    hovertemplate='<b>%{x}</b><br>Cost: $%{y:.6f}<br>Questions: %{customdata[0]}<br>Avg: $%{customdata[1]:.6f}<extra></extra>',
-                    customdata=weekly_cost[['question_count', 'avg_cost']].values
-                ))
-
-                fig.update_layout(
-                    title="Weekly Cost",
-                    xaxis_title="Week",
-                    yaxis_title="Total Cost ($)",
-                    height=400,
-                    showlegend=False
-                )
-                st.plotly_chart(fig, width='stretch', key="weekly_cost_bar")
-
-                # Weekly cost table
-                with st.expander("📋 Weekly Cost Details"):
-                    display_weekly = weekly_cost.copy()
-                    display_weekly.columns = ['Week', 'Total Cost ($)', 'Questions', 'Avg Cost ($)', 'Max Cost ($)']
-                    st.dataframe(display_weekly, width='stretch', hide_index=True)
-
-            st.markdown("---")
-
-            # Cumulative cost
-            st.markdown("### 📈 Cumulative Cost Over Time")
-            if 'timestamp' in cost_df.columns:
-                cost_time = cost_df.sort_values('timestamp').copy()
-                cost_time['cumulative_cost'] = cost_time['total_cost'].cumsum()
-
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(
-                    x=cost_time['timestamp'],
-                    y=cost_time['cumulative_cost'],
-                    mode='lines',
-                    fill='tozeroy',
-                    line=dict(color=BYU_COLORS['primary'], width=2),
-                    fillcolor='rgba(0, 46, 93, 0.1)',
-                    hovertemplate='%{x}<br>Cumulative: $%{y:.6f}<extra></extra>'
-                ))
-
-                fig.update_layout(
-                    title="Cumulative Cost",
-                    xaxis_title="Time",
-                    yaxis_title="Cumulative Cost ($)",
-                    height=400,
-                    showlegend=False
-                )
-                st.plotly_chart(fig, width='stretch', key="cumulative_cost_line")
-
-            st.markdown("---")
-
-            # Cost distribution
-            st.markdown("### 📊 Cost Distribution")
-            fig = go.Figure()
-            fig.add_trace(go.Histogram(
-                x=cost_df['total_cost'],
-                nbinsx=50,
-                marker=dict(color=BYU_COLORS['accent1']),
-                hovertemplate='Cost: $%{x:.6f}<br>Count: %{y}<extra></extra>'
-            ))
-
-            fig.update_layout(
-                title="Cost Distribution (per question)",
-                xaxis_title="Cost ($)",
-                yaxis_title="Number of Questions",
-                height=350,
-                showlegend=False
-            )
-            st.plotly_chart(fig, width='stretch', key="cost_distribution_hist")
-
-            # Cost summary stats
-            with st.expander("📊 Cost Statistics"):
-                col1, col2, col3, col4 = st.columns(4)
-                with col1:
-                    st.metric("Min", f"${cost_df['total_cost'].min():.8f}")
-                with col2:
-                    st.metric("Median", f"${cost_df['total_cost'].median():.6f}")
-                with col3:
-                    st.metric("Mean", f"${cost_df['total_cost'].mean():.6f}")
-                with col4:
-                    st.metric("Max", f"${cost_df['total_cost'].max():.6f}")
+            _render_cost_tab(df.loc[cost_mask, cost_tab_cols], aggs.get('weekly_cost'), data_version)
 
     # ── TAB 2: Latency Analysis ──
     with tab2:
         if not has_latency:
             st.info("No latency data available in the current dataset.")
+        elif lat_series.empty:
+            st.info("No positive-latency traces in the current dataset.")
         else:
-            lat_df = df[df['latency'].notna() & (df['latency'] > 0)].copy()
-
-            st.markdown("### ⚡ Latency Distribution")
-
-            fig = go.Figure()
-            fig.add_trace(go.Histogram(
-                x=lat_df['latency'],
-                nbinsx=50,
-                marker=dict(color=BYU_COLORS['secondary']),
-                hovertemplate='Latency: %{x:.2f}s<br>Count: %{y}<extra></extra>'
-            ))
-
-            # Add percentile lines
-            p50 = lat_df['latency'].median()
-            p95 = lat_df['latency'].quantile(0.95)
-            p99 = lat_df['latency'].quantile(0.99)
-
-            for pval, plabel, pcolor in [
-                (p50, 'P50 (Median)', '#4caf50'),
-                (p95, 'P95', '#FFB933'),
-                (p99, 'P99', '#C5050C')
-            ]:
-                fig.add_vline(
-                    x=pval, line_dash="dash", line_color=pcolor,
-                    annotation_text=f"{plabel}: {pval:.2f}s",
-                    annotation_position="top right"
-                )
-
-            fig.update_layout(
-                title="Latency Distribution",
-                xaxis_title="Latency (seconds)",
-                yaxis_title="Number of Questions",
-                height=400,
-                showlegend=False
-            )
-            st.plotly_chart(fig, width='stretch', key="latency_distribution_hist")
-
-            # Percentile summary
-            st.markdown("### 📊 Latency Percentiles")
-            with st.expander("ℹ️ What do P50, P95, P99 mean?"):
-                st.markdown("""
-                These are **percentiles** — they tell you how fast the chatbot responds for most users.
-
-                - **P50 (Median):** Half of all responses are faster than this.
-                - **P95:** 95% of responses are faster — only 1 in 20 is slower.
-                - **P99:** 99% of responses are faster — only the rare slowest 1%.
-
-                Lower is better. If P95 is high, some users are waiting a long time.
-                """)
-            col1, col2, col3, col4, col5 = st.columns(5)
-            with col1:
-                st.metric("Min", f"{lat_df['latency'].min():.3f}s")
-            with col2:
-                st.metric("P50 (Median)", f"{p50:.3f}s")
-            with col3:
-                st.metric("P90", f"{lat_df['latency'].quantile(0.90):.3f}s")
-            with col4:
-                st.metric("P95", f"{p95:.3f}s")
-            with col5:
-                st.metric("P99", f"{p99:.3f}s")
-
-            st.markdown("---")
-
-            # Latency over time
-            st.markdown("### 📈 Latency Trend Over Time")
-            if 'timestamp' in lat_df.columns:
-                lat_df['date'] = pd.to_datetime(lat_df['timestamp'], format='ISO8601', errors='coerce').dt.date
-                daily_lat = lat_df.groupby('date').agg(
-                    avg_latency=('latency', 'mean'),
-                    median_latency=('latency', 'median'),
-                    p95_latency=('latency', lambda x: x.quantile(0.95)),
-                    count=('latency', 'count')
-                ).reset_index()
-
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(
-                    x=daily_lat['date'], y=daily_lat['avg_latency'],
-                    name='Average', mode='lines+markers',
-                    line=dict(color=BYU_COLORS['primary'], width=2),
-                    hovertemplate='%{x}<br>Avg: %{y:.3f}s<extra></extra>'
-                ))
-                fig.add_trace(go.Scatter(
-                    x=daily_lat['date'], y=daily_lat['median_latency'],
-                    name='Median', mode='lines+markers',
-                    line=dict(color='#4caf50', width=2),
-                    hovertemplate='%{x}<br>Median: %{y:.3f}s<extra></extra>'
-                ))
-                fig.add_trace(go.Scatter(
-                    x=daily_lat['date'], y=daily_lat['p95_latency'],
-                    name='P95', mode='lines+markers',
-                    line=dict(color=BYU_COLORS['accent2'], width=2, dash='dash'),
-                    hovertemplate='%{x}<br>P95: %{y:.3f}s<extra></extra>'
-                ))
-
-                fig.update_layout(
-                    title="Daily Latency Trend",
-                    xaxis_title="Date",
-                    yaxis_title="Latency (seconds)",
-                    height=400,
-                    hovermode='x unified',
-                    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-                )
-                st.plotly_chart(fig, width='stretch', key="latency_trend_line")
-
-            st.markdown("---")
-
-            # Weekly latency breakdown
-            st.markdown("### 📅 Weekly Latency Summary")
-            if 'timestamp' in lat_df.columns:
-                lat_df['week'] = pd.to_datetime(lat_df['timestamp'], format='ISO8601', errors='coerce').dt.strftime('%Y-W%U')
-                weekly_lat = lat_df.groupby('week').agg(
-                    avg_latency=('latency', 'mean'),
-                    median_latency=('latency', 'median'),
-                    p95_latency=('latency', lambda x: x.quantile(0.95)),
-                    count=('latency', 'count')
-                ).reset_index().sort_values('week')
-
-                fig = go.Figure()
-                fig.add_trace(go.Bar(
-                    x=weekly_lat['week'], y=weekly_lat['avg_latency'],
-                    name='Average',
-                    marker=dict(color=BYU_COLORS['primary']),
-                    hovertemplate='<b>%{x}</b><br>Avg: %{y:.3f}s<br>Count: %{customdata}<extra></extra>',
-                    customdata=weekly_lat['count']
-                ))
-                fig.add_trace(go.Scatter(
-                    x=weekly_lat['week'], y=weekly_lat['p95_latency'],
-                    name='P95',
-                    mode='lines+markers',
-                    line=dict(color=BYU_COLORS['accent2'], width=2),
-                    hovertemplate='<b>%{x}</b><br>P95: %{y:.3f}s<extra></extra>'
-                ))
-
-                fig.update_layout(
-                    title="Weekly Latency",
-                    xaxis_title="Week",
-                    yaxis_title="Latency (seconds)",
-                    height=400,
-                    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-                )
-                st.plotly_chart(fig, width='stretch', key="weekly_latency_bar")
+            _render_latency_tab(df.loc[lat_mask, ['latency']], lat_pcts, aggs.get('daily_lat'), aggs.get('weekly_lat'),
+                                data_version)
 
     # ── TAB 3: Operational Overview ──
     with tab3:
-        st.markdown("### 📊 Operational Overview")
-
-        # Source comparison
-        has_source = 'source_type' in df.columns
-        if has_source and (has_cost or has_latency):
-            st.markdown("#### 🧭 Answer Path Comparison")
-            with st.expander("ℹ️ What are these answer paths?"):
-                st.markdown("""
-                **RAG (Retrieval-Augmented Generation)** is the default path — the chatbot searches a knowledge base
-                and uses AI to write a custom answer. Most questions go through RAG.
-
-                **Calendar Pipeline** is a specialized path for date-related questions (e.g., "When does Block 3 start?").
-                Instead of searching the knowledge base, it looks up the academic calendar directly and returns
-                a structured calendar card. Calendar questions are typically slower (more steps) but more accurate for dates.
-
-                **Tuition** is the calculator path for rate and full-degree journey questions. It uses the tuition card
-                data instead of relying only on retrieved text.
-                """)
-
-            label_map = {
-                'rag': 'RAG',
-                'calendar': 'Calendar',
-                'tuition': 'Tuition',
-                'tuition_journey': 'Tuition Journey',
-                'draft_edit': 'Draft Edit',
-            }
-            source_df = df.copy()
-            source_df['source_type'] = source_df['source_type'].fillna('rag').astype(str).str.lower()
-
-            summary_rows = []
-            for source_type, group in source_df.groupby('source_type'):
-                row = {
-                    'Answer Path': label_map.get(source_type, source_type.replace('_', ' ').title()),
-                    'Questions': len(group),
-                }
-                if has_latency:
-                    lat = group[group['latency'] > 0]['latency']
-                    row['Avg Latency (s)'] = round(lat.mean(), 2) if len(lat) > 0 else None
-                    row['P95 Latency (s)'] = round(lat.quantile(0.95), 2) if len(lat) > 0 else None
-                if has_cost:
-                    cost = group[group['total_cost'] > 0]['total_cost']
-                    row['Avg Cost ($)'] = round(cost.mean(), 6) if len(cost) > 0 else None
-                    row['Total Cost ($)'] = round(cost.sum(), 6) if len(cost) > 0 else 0
-                summary_rows.append(row)
-
-            source_summary = pd.DataFrame(summary_rows).sort_values('Questions', ascending=False)
-
-            col1, col2, col3 = st.columns(3)
-
-            with col1:
-                rag_count = int((source_df['source_type'] == 'rag').sum())
-                st.metric("RAG Questions", f"{rag_count:,}")
-                specialized = len(source_df) - rag_count
-                st.metric("Specialized Cards", f"{specialized:,}")
-
-            with col2:
-                if has_latency:
-                    rag_df = source_df[source_df['source_type'] == 'rag']
-                    specialized_df = source_df[source_df['source_type'] != 'rag']
-                    rag_lat = rag_df[rag_df['latency'] > 0]['latency']
-                    specialized_lat = specialized_df[specialized_df['latency'] > 0]['latency']
-                    st.metric("RAG Avg Latency",
-                              f"{rag_lat.mean():.2f}s" if len(rag_lat) > 0 else "N/A")
-                    st.metric("Specialized Avg Latency",
-                              f"{specialized_lat.mean():.2f}s" if len(specialized_lat) > 0 else "N/A")
-
-            with col3:
-                if has_cost:
-                    rag_df = source_df[source_df['source_type'] == 'rag']
-                    specialized_df = source_df[source_df['source_type'] != 'rag']
-                    rag_cost = rag_df[rag_df['total_cost'] > 0]['total_cost']
-                    specialized_cost = specialized_df[specialized_df['total_cost'] > 0]['total_cost']
-                    st.metric("RAG Avg Cost",
-                              f"${rag_cost.mean():.6f}" if len(rag_cost) > 0 else "N/A")
-                    st.metric("Specialized Avg Cost",
-                              f"${specialized_cost.mean():.6f}" if len(specialized_cost) > 0 else "N/A")
-
-            st.dataframe(source_summary, width='stretch', hide_index=True)
-
-            # Side-by-side latency distributions
-            if has_latency and source_df['source_type'].nunique() > 1:
-                fig = go.Figure()
-                colors = [BYU_COLORS['primary'], BYU_COLORS['accent2'], BYU_COLORS['secondary'], BYU_COLORS['accent1']]
-                for idx, (source_type, group) in enumerate(source_df.groupby('source_type')):
-                    lat_vals = group[group['latency'] > 0]['latency']
-                    if len(lat_vals) == 0:
-                        continue
-                    fig.add_trace(go.Histogram(
-                        x=lat_vals,
-                        name=label_map.get(source_type, source_type.replace('_', ' ').title()),
-                        marker=dict(color=colors[idx % len(colors)]),
-                        opacity=0.7, nbinsx=30
-                    ))
-                fig.update_layout(
-                    title="Latency Distribution by Answer Path",
-                    xaxis_title="Latency (seconds)",
-                    yaxis_title="Count",
-                    barmode='overlay', height=350,
-                    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-                )
-                st.plotly_chart(fig, width='stretch', key="rag_vs_cal_latency")
-
-            st.markdown("---")
-
-        # Cost vs Volume correlation
-        if has_cost and 'timestamp' in df.columns:
-            st.markdown("#### 💰 Cost vs Question Volume")
-            cost_nonzero = df[df['total_cost'].notna() & (df['total_cost'] > 0)].copy()
-            cost_nonzero['week'] = pd.to_datetime(cost_nonzero['timestamp'], format='ISO8601', errors='coerce').dt.strftime('%Y-W%U')
-
-            weekly_corr = cost_nonzero.groupby('week').agg(
-                total_cost=('total_cost', 'sum'),
-                question_count=('total_cost', 'count')
-            ).reset_index()
-
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(
-                x=weekly_corr['question_count'],
-                y=weekly_corr['total_cost'],
-                mode='markers+text',
-                text=weekly_corr['week'],
-                textposition='top center',
-                marker=dict(
-                    color=BYU_COLORS['primary'],
-                    size=12,
-                    line=dict(width=1, color='white')
-                ),
-                hovertemplate='<b>%{text}</b><br>Questions: %{x}<br>Cost: $%{y:.6f}<extra></extra>'
-            ))
-
-            fig.update_layout(
-                title="Cost vs Question Volume (by Week)",
-                xaxis_title="Number of Questions",
-                yaxis_title="Total Cost ($)",
-                height=400,
-                showlegend=False
-            )
-            st.plotly_chart(fig, width='stretch', key="cost_vs_volume_scatter")
-
-        st.markdown("---")
-
-        # Efficiency insights
-        if has_cost and has_latency:
-            st.markdown("#### 💡 Efficiency Insights")
-
-            cost_data = df[df['total_cost'] > 0]['total_cost']
-            lat_data = df[df['latency'] > 0]['latency']
-
-            col1, col2 = st.columns(2)
-
-            with col1:
-                st.markdown("**Cost Efficiency:**")
-                if len(cost_data) > 0:
-                    st.markdown(f"- **Total spend:** ${cost_data.sum():.4f}")
-                    st.markdown(f"- **Cost per question:** ${cost_data.mean():.6f} avg")
-                    if cost_data.sum() > 0:
-                        daily_rate = cost_data.sum() / max(1, (df['timestamp'].max() - df['timestamp'].min()).days)
-                        monthly_estimate = daily_rate * 30
-                        st.markdown(f"- **Estimated monthly:** ${monthly_estimate:.4f}")
-
-            with col2:
-                st.markdown("**Latency Performance:**")
-                if len(lat_data) > 0:
-                    fast_count = (lat_data < 3.0).sum()
-                    fast_pct = fast_count / len(lat_data) * 100
-                    st.markdown(f"- **Under 3s:** {fast_count} ({fast_pct:.1f}%)")
-                    slow_count = (lat_data > 10.0).sum()
-                    slow_pct = slow_count / len(lat_data) * 100
-                    st.markdown(f"- **Over 10s:** {slow_count} ({slow_pct:.1f}%)")
-                    st.markdown(f"- **Avg response:** {lat_data.mean():.2f}s")
-
-            with st.expander("ℹ️ Reading these numbers"):
-                st.markdown("""
-                - **Cost** is what we pay the AI provider (OpenAI) per question. Most questions cost a fraction of a cent.
-                - **Latency** is how long the user waits for a response. This is end-to-end time including
-                  retrieval, AI processing, and streaming.
-                - Calendar questions tend to cost slightly more and take longer because they involve multiple
-                  steps (intent detection, date extraction, card building).
-                """)
+        # Series with no positive values are passed as None so their charts are skipped
+        _render_operational_tab(
+            df,
+            cost_series if has_cost and not cost_series.empty else None,
+            lat_series if has_latency and not lat_series.empty else None,
+            aggs.get('weekly_cost'),
+            data_version
+        )
+
 
 
 if __name__ == "__main__":
@@ -7,11 +7,15 @@ import pandas as pd
 import plotly.graph_objects as go
 import sys
 from pathlib import Path
+from typing import Optional
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config import PAGE_CONFIG, get_theme_css, BYU_COLORS
-from utils.data_loader import ensure_data_loaded
+from utils.data_loader import ensure_data_loaded, flatten_newlines, parse_timestamps
+from utils.visualizations import (
+    downsample_lttb, extract_feedback_reasons, histogram_bar, normalize_feedback_labels, show_figure
+)
 
 # Configure page settings
 st.set_page_config(**PAGE_CONFIG)
@@ -22,32 +26,361 @@ if 'theme' not in st.session_state:
 st.markdown(get_theme_css(st.session_state.theme), unsafe_allow_html=True)
 
 
-def normalize_feedback_label(value):
-    """Normalize feedback values into helpful/unhelpful buckets."""
-    if pd.isna(value):
-        return None
-    text = str(value).strip().lower()
-    if text in {'good', 'helpful', 'thumbs_up', 'positive', '1', 'true', 'yes'}:
-        return 'helpful'
-    if text in {'bad', 'unhelpful', 'thumbs_down', 'negative', '-1', 'false', 'no'}:
-        return 'unhelpful'
-    return None
+# Chart colors, looked up once
+PRIMARY_COLOR = BYU_COLORS['primary']
+SECONDARY_COLOR = BYU_COLORS['secondary']
+
+
+# Joins columns in the search blob; never typed into the search box, so a match cannot span two columns
+SEARCH_BLOB_SEPARATOR = '\x1f'
+
+
+def _search_blob(view: pd.DataFrame) -> pd.Series:
+    """
+    Lowercased text of every column of each row, built once per snapshot (see _session_memo)
+    so a search is a single literal str.contains instead of one scan per column.
+    """
+    texts = [view[col].astype('string').fillna('') for col in view.columns]
+    return texts[0].str.cat(texts[1:], sep=SEARCH_BLOB_SEPARATOR).str.lower()
+
+
+def _observed_counts(ids: pd.Series) -> pd.Series:
+    """
+    Rows per ID, largest first, skipping missing IDs, as int32 (counts are bounded by the row count).
+    On a categorical, value_counts also lists unused categories (e.g. after filtering); those are dropped.
+    """
+    counts = ids.value_counts()
+    return counts[counts > 0].astype('int32')
+
+
+def _count_summary(counts: pd.Series) -> dict:
+    """
+    Number of IDs, single/repeat split, mean and max of a per-ID count series, from one array.
+    Every count is at least 1, so repeats are the IDs that are not singles.
+    """
+    qc = counts.to_numpy()
+    singles = int((qc == 1).sum())
+    return {
+        'ids': len(qc),
+        'singles': singles,
+        'repeats': len(qc) - singles,
+        'mean': qc.mean() if len(qc) else 0,
+        'max': int(qc.max()) if len(qc) else 0,
+    }
+
+
+def _engagement_aggregates(df: pd.DataFrame, has_sessions: bool, has_users: bool, has_feedback: bool) -> dict:
+    """Per-session/per-user question counts with their KPI summaries, and normalized feedback labels."""
+    # Counted on the categorical codes
+    session_counts = _observed_counts(df['session_id']) if has_sessions else None
+    user_counts = _observed_counts(df['user_id']) if has_users else None
+    feedback_norm = normalize_feedback_labels(df['user_feedback']) if has_feedback else None
+    session_summary = _count_summary(session_counts) if has_sessions else None
+    user_summary = _count_summary(user_counts) if has_users else None
+
+    return {
+        'user_counts': user_counts,
+        'feedback_norm': feedback_norm,
+        'session_summary': session_summary,
+        'user_summary': user_summary,
+        'unique_sessions': session_summary['ids'] if has_sessions else 0,
+        'unique_users': user_summary['ids'] if has_users else 0,
+        'avg_per_session': session_summary['mean'] if has_sessions else 0,
+        'total_feedback': int(feedback_norm.notna().sum()) if has_feedback else 0,
+    }
+
+
+def _feedback_quality(df: pd.DataFrame, feedback_norm: pd.Series) -> dict:
+    """Helpful/unhelpful counts and the display table of unhelpful responses with a reason."""
+    is_unhelpful = feedback_norm == 'unhelpful'
+    quality = {
+        'total_feedback': int(feedback_norm.notna().sum()),
+        'helpful_count': int((feedback_norm == 'helpful').sum()),
+        'unhelpful_count': int(is_unhelpful.sum()),
+        'reason_view': None,
+    }
+
+    # Reasons are only shown for unhelpful responses, so only those rows are parsed
+    unhelpful_df = df[is_unhelpful]
+    reasons = extract_feedback_reasons(unhelpful_df)
+    if reasons.isna().all():
+        return quality
+    unhelpful_with_reason = unhelpful_df[reasons.notna()].assign(feedback_reason=reasons)
+
+    reason_cols = ['timestamp', 'country', 'Country', 'state', 'State',
+                   'city', 'City', 'question', 'output', 'feedback_reason']
+    available_reason_cols = [c for c in reason_cols if c in unhelpful_with_reason.columns]
+    reason_view = unhelpful_with_reason[available_reason_cols].copy()
+    if 'output' in reason_view.columns:
+        reason_view['output'] = flatten_newlines(reason_view['output'])
+    quality['reason_view'] = reason_view.rename(columns={
+        'question': 'Question',
+        'timestamp': 'Timestamp',
+        'output': 'Chatbot Response',
+        'feedback_reason': 'Reason',
+        'country': 'Country',
+        'state': 'State',
+        'city': 'City',
+    })
+    return quality
+
+
+def _daily_sessions(df: pd.DataFrame) -> pd.DataFrame:
+    """Unique sessions per day, downsampled for plotting."""
+    # timestamp is already datetime64 (parsed once in merge_data_for_dashboard);
+    # group on day floors and convert only the result to dates
+    with_session = df['session_id'].notna()
+    session_days = df.loc[with_session, 'timestamp'].dt.floor('D')
+    daily_sessions = (
+        df.loc[with_session, 'session_id'].groupby(session_days).nunique()
+        .rename_axis('date').reset_index(name='sessions')
+    )
+    # Long histories: send at most 500 points that keep the line's shape
+    day_offsets = (daily_sessions['date'] - daily_sessions['date'].min()).dt.days
+    daily_sessions = daily_sessions.iloc[downsample_lttb(day_offsets, daily_sessions['sessions'])]
+    return daily_sessions.assign(date=daily_sessions['date'].dt.date)
+
+
+@st.cache_data(ttl=3600, max_entries=16, show_spinner=False)
+def _cached_result(name: str, data_version, _compute, _args: tuple):
+    """
+    Result of one of this page's helpers, computed once per data snapshot.
+    Only the helper name and data_version are hashed; the helper and its inputs are not.
+    """
+    return _compute(*_args)
+
+
+def _session_memo(name: str, data_version, compute, *args):
+    """
+    Result of compute(*args), cached per data_version and reused across reruns of this browser session.
+    st.cache_data hands back a fresh unpickled copy on every call; the memo keeps one copy
+    per data_version in session_state, so tab switches and widget reruns skip the copy.
+    Without a data_version the inputs cannot be identified, so compute runs uncached.
+    """
+    if data_version is None:
+        return compute(*args)
+    key = f'fb_page::{name}'
+    memo = st.session_state.get(key)
+    if memo is None or memo[0] != data_version:
+        memo = (data_version, _cached_result(name, data_version, compute, args))
+        st.session_state[key] = memo
+    return memo[1]
+
+
+def _user_engagement_figure(user_counts: pd.Series) -> go.Figure:
+    """Histogram of questions per user: one bar per question count, or 30 bins for long tails."""
+    fig = go.Figure()
+    fig.add_trace(histogram_bar(
+        user_counts,
+        bins=30,
+        marker=dict(color=SECONDARY_COLOR),
+        hovertemplate='Questions: %{x:.0f}<br>Users: %{y}<extra></extra>'
+    ))
+    fig.update_layout(
+        title="Distribution of Questions per User",
+        xaxis_title="Number of Questions",
+        yaxis_title="Number of Users",
+        height=350,
+        showlegend=False
+    )
+    return fig
+
+
+def _daily_sessions_figure(daily_sessions: pd.DataFrame) -> go.Figure:
+    """Line chart of daily unique sessions."""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=daily_sessions['date'].to_numpy(),
+        y=daily_sessions['sessions'].to_numpy(),
+        mode='lines+markers',
+        line=dict(color=PRIMARY_COLOR, width=2),
+        hovertemplate='%{x}<br>Sessions: %{y}<extra></extra>'
+    ))
+    fig.update_layout(
+        title="Daily Unique Sessions",
+        xaxis_title="Date",
+        yaxis_title="Unique Sessions",
+        height=350,
+        showlegend=False
+    )
+    return fig
+
+
+def _submission_days(gf_df: pd.DataFrame) -> pd.Series:
+    """
+    Day (datetime64 floor) of each general feedback submission, parsed once per snapshot
+    so search reruns only select from it.
+    """
+    return parse_timestamps(gf_df['timestamp']).dt.floor('D')
+
+
+def _daily_submissions_figure(gf_days: pd.Series) -> go.Figure:
+    """Bar chart of general feedback submissions per day."""
+    daily_gf = gf_days.value_counts().sort_index().rename_axis('date').reset_index(name='count')
+    daily_gf['date'] = daily_gf['date'].dt.date
+
+    fig = go.Figure()
+    gf_counts = daily_gf['count'].to_numpy()
+    fig.add_trace(go.Bar(
+        x=daily_gf['date'].to_numpy(),
+        y=gf_counts,
+        marker=dict(color=PRIMARY_COLOR),
+        text=gf_counts,
+        textposition='outside'
+    ))
+    fig.update_layout(
+        title="Daily Feedback Submissions",
+        xaxis_title="Date",
+        yaxis_title="Submissions",
+        height=350,
+        showlegend=False
+    )
+    return fig
+
+
+@st.fragment
+def _render_general_feedback_tab(gf_df: pd.DataFrame, data_version=None):
+    """General Feedback tab: searchable submissions table and daily volume."""
+    st.markdown("### 📋 General Feedback Submissions")
+    st.metric("Total Submissions", f"{len(gf_df):,}")
+
+    has_timestamps = 'timestamp' in gf_df.columns
+    gf_days = _session_memo('gf_days', data_version, _submission_days, gf_df) if has_timestamps else None
+
+    # Keep table simple: hide technical/redundant columns. Search scans the same
+    # visible columns, so large hidden fields (output, tags) stay out of the scan
+    hidden_cols = ['id', 'trace_id', 'name', 'output', 'tags']
+    display_cols = [c for c in gf_df.columns if c not in hidden_cols]
+    view = gf_df[display_cols] if display_cols else gf_df
+
+    search = st.text_input("🔍 Search feedback", placeholder="Type to filter...", key="gf_search")
+    if search:
+        # Literal, case-insensitive match
+        blob = _session_memo('gf_search_blob', data_version, _search_blob, view)
+        matches = blob.str.contains(search.lower(), regex=False, na=False)
+        view = view[matches]
+        if gf_days is not None:
+            gf_days = gf_days[matches]
+
+    st.dataframe(view, width='stretch', hide_index=True)
+
+    if gf_days is not None and len(view) > 1:
+        st.markdown("#### 📈 Submissions Over Time")
+        # Searched views are built per keystroke; the full table's chart is cached per snapshot
+        show_figure("gf_over_time", None if search else data_version, _daily_submissions_figure, gf_days)
+
+
+def _render_session_indicators(session_summary: Optional[dict]):
+    """Session-level indicators (chart removed for simplicity)."""
+    if session_summary is None:
+        return
+
+    st.markdown("#### 💬 Session Indicators")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Single-Question Sessions", f"{session_summary['singles']}")
+    with col2:
+        st.metric("Multi-Question Sessions", f"{session_summary['repeats']}")
+    with col3:
+        st.metric("Avg Questions/Session", f"{session_summary['mean']:.1f}")
+    with col4:
+        st.metric("Max Questions in Session", f"{session_summary['max']}")
+
+    st.markdown("---")
+
+
+def _render_user_engagement(user_counts: Optional[pd.Series], user_summary: Optional[dict], data_version):
+    """Questions-per-user chart and user KPIs."""
+    if user_summary is None:
+        return
+
+    st.markdown("#### 🧑 User Engagement")
+    show_figure("questions_per_user", data_version, _user_engagement_figure, user_counts)
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Total Tracked Users", f"{user_summary['ids']:,}")
+    with col2:
+        st.metric("Avg Questions/User", f"{user_summary['mean']:.1f}")
+    with col3:
+        st.metric("One-Time Users", f"{user_summary['singles']:,}")
+    with col4:
+        st.metric("Repeat Users", f"{user_summary['repeats']:,}")
+
+    st.markdown("---")
+
 
+def _render_feedback_quality(df: pd.DataFrame, data_version, feedback_norm: Optional[pd.Series]):
+    """Helpful/unhelpful rates and the unhelpful reasons table."""
+    if feedback_norm is None:
+        return
 
-def extract_feedback_reason(row: pd.Series):
-    """Get feedback reason from new feedback_comment field or legacy user_feedback text."""
-    comment = row.get('feedback_comment', None)
-    if pd.notna(comment) and str(comment).strip() != '':
-        return str(comment).strip()
+    st.markdown("#### ⭐ Response Quality")
+    quality = _session_memo('feedback_quality', data_version, _feedback_quality, df, feedback_norm)
 
-    value = row.get('user_feedback', None)
-    if pd.notna(value):
-        text = str(value).strip()
-        if ':' in text:
-            reason = text.split(':', 1)[1].strip()
-            return reason if reason else None
+    total_feedback = quality['total_feedback']
+    if total_feedback == 0:
+        st.info("Feedback entries exist, but none could be interpreted as Good/Bad yet.")
+        return
 
-    return None
+    helpful_count = quality['helpful_count']
+    unhelpful_count = quality['unhelpful_count']
+
+    helpful_rate = helpful_count / total_feedback * 100
+    unhelpful_rate = unhelpful_count / total_feedback * 100
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Total Feedback", f"{total_feedback:,}")
+    with col2:
+        st.metric("Helpful Rate", f"{helpful_rate:.1f}%", delta=f"{helpful_count:,} responses")
+    with col3:
+        st.metric("Unhelpful Rate", f"{unhelpful_rate:.1f}%", delta=f"{unhelpful_count:,} responses")
+
+    # Show reasons users gave for unhelpful responses
+    reason_view = quality['reason_view']
+    if reason_view is not None:
+        st.markdown("#### 🗒️ Unhelpful Feedback Reasons")
+        st.dataframe(reason_view, width='stretch', hide_index=True)
+
+
+def _render_sessions_over_time(df: pd.DataFrame, data_version, has_sessions: bool):
+    """Daily unique sessions line."""
+    if not has_sessions or 'timestamp' not in df.columns:
+        return
+
+    st.markdown("---")
+    st.markdown("#### 📈 Sessions Over Time")
+    daily_sessions = _session_memo('daily_sessions', data_version, _daily_sessions, df)
+    show_figure("sessions_over_time", data_version, _daily_sessions_figure, daily_sessions)
+
+
+@st.fragment
+def _render_user_session_tab(df: pd.DataFrame, data_version, aggs: dict, has_sessions: bool):
+    """User & Session Analytics tab: session indicators, user engagement, quality and daily sessions."""
+    st.markdown("### 👥 User & Session Analytics")
+
+    # Each section returns early when its data is missing (its aggregate is None)
+    _render_session_indicators(aggs['session_summary'])
+    _render_user_engagement(aggs['user_counts'], aggs['user_summary'], data_version)
+    _render_feedback_quality(df, data_version, aggs['feedback_norm'])
+    _render_sessions_over_time(df, data_version, has_sessions)
+
+
+@st.fragment
+def _render_feature_events_tab(events_df: pd.DataFrame):
+    """Feature Events tab: event totals, counts per type and the raw event table."""
+    st.markdown("### 🧩 Feature Events")
+    st.metric("Total Events", f"{len(events_df):,}")
+
+    if 'name' in events_df.columns:
+        counts = events_df['name'].fillna('unknown').value_counts().reset_index()
+        counts.columns = ['Event Type', 'Count']
+        st.dataframe(counts, width='stretch', hide_index=True)
+
+    hidden_cols = ['id', 'metadata', 'tags']
+    display_cols = [c for c in events_df.columns if c not in hidden_cols]
+    st.dataframe(events_df[display_cols], width='stretch', hide_index=True)
 
 
 def main():
@@ -58,7 +391,8 @@ def main():
     # Ensure data is loaded
     ensure_data_loaded()
 
-    df = st.session_state['merged_df'].copy()
+    # Read-only reference; blocks that add columns build their own frame with assign()
+    df = st.session_state['merged_df']
     raw_data = st.session_state.get('raw_data', {})
 
     if df.empty:
@@ -80,6 +414,11 @@ def main():
         """)
         st.stop()
 
+    # KPI scalars plus the counts/labels shared with the tabs below, computed once per data version
+    data_version = st.session_state.get('data_version')
+    aggs = _session_memo('engagement', data_version, _engagement_aggregates,
+                         df, has_sessions, has_users, has_feedback)
+
     # ── KPI Cards ──
     st.markdown("## 📊 Key Metrics")
 
@@ -87,25 +426,19 @@ def main():
 
     with col1:
         if has_users:
-            unique_users = df['user_id'].nunique()
-            st.metric("👥 Unique Users", f"{unique_users:,}")
+            st.metric("👥 Unique Users", f"{aggs['unique_users']:,}")
 
     with col2:
         if has_sessions:
-            unique_sessions = df['session_id'].nunique()
-            st.metric("💬 Unique Sessions", f"{unique_sessions:,}")
+            st.metric("💬 Unique Sessions", f"{aggs['unique_sessions']:,}")
 
     with col3:
         if has_sessions:
-            questions_per_session = df[df['session_id'].notna()].groupby('session_id').size()
-            avg_per_session = questions_per_session.mean() if not questions_per_session.empty else 0
-            st.metric("📊 Avg Q/Session", f"{avg_per_session:.1f}")
+            st.metric("📊 Avg Q/Session", f"{aggs['avg_per_session']:.1f}")
 
     with col4:
         if has_feedback:
-            normalized = df['user_feedback'].apply(normalize_feedback_label)
-            total_feedback = normalized.notna().sum()
-            st.metric("⭐ Feedback Entries", f"{total_feedback:,}")
+            st.metric("⭐ Feedback Entries", f"{aggs['total_feedback']:,}")
 
     st.markdown("---")
 
@@ -121,140 +454,7 @@ def main():
         if not has_sessions and not has_users and not has_feedback:
             st.info("No user, session, or feedback data available in the current dataset.")
         else:
-            st.markdown("### 👥 User & Session Analytics")
-
-            # Session-level indicators (chart removed for simplicity)
-            if has_sessions:
-                session_df = df[df['session_id'].notna()].copy()
-                session_counts = session_df.groupby('session_id').size().reset_index(name='question_count')
-
-                st.markdown("#### 💬 Session Indicators")
-                col1, col2, col3, col4 = st.columns(4)
-                with col1:
-                    st.metric("Single-Question Sessions", f"{(session_counts['question_count'] == 1).sum()}")
-                with col2:
-                    st.metric("Multi-Question Sessions", f"{(session_counts['question_count'] > 1).sum()}")
-                with col3:
-                    st.metric("Avg Questions/Session", f"{session_counts['question_count'].mean():.1f}")
-                with col4:
-                    st.metric("Max Questions in Session", f"{session_counts['question_count'].max()}")
-
-                st.markdown("---")
-
-            # User engagement chart
-            if has_users:
-                user_df = df[df['user_id'].notna()].copy()
-                user_counts = user_df.groupby('user_id').size().reset_index(name='question_count')
-
-                st.markdown("#### 🧑 User Engagement")
-                fig = go.Figure()
-                fig.add_trace(go.Histogram(
-                    x=user_counts['question_count'],
-                    nbinsx=min(30, max(1, int(user_counts['question_count'].max()))),
-                    marker=dict(color=BYU_COLORS['secondary']),
-                    hovertemplate='Questions: %{x}<br>Users: %{y}<extra></extra>'
-                ))
-                fig.update_layout(
-                    title="Distribution of Questions per User",
-                    xaxis_title="Number of Questions",
-                    yaxis_title="Number of Users",
-                    height=350,
-                    showlegend=False
-                )
-                st.plotly_chart(fig, width='stretch', key="questions_per_user")
-
-                col1, col2, col3, col4 = st.columns(4)
-                with col1:
-                    st.metric("Total Tracked Users", f"{user_counts.shape[0]:,}")
-                with col2:
-                    st.metric("Avg Questions/User", f"{user_counts['question_count'].mean():.1f}")
-                with col3:
-                    st.metric("One-Time Users", f"{(user_counts['question_count'] == 1).sum():,}")
-                with col4:
-                    st.metric("Repeat Users", f"{(user_counts['question_count'] > 1).sum():,}")
-
-                st.markdown("---")
-
-            # Feedback quality summary
-            if has_feedback:
-                st.markdown("#### ⭐ Response Quality")
-                feedback_df = df[df['user_feedback'].notna()].copy()
-                feedback_df['feedback_norm'] = feedback_df['user_feedback'].apply(normalize_feedback_label)
-                feedback_df = feedback_df[feedback_df['feedback_norm'].notna()]
-
-                if feedback_df.empty:
-                    st.info("Feedback entries exist, but none could be interpreted as Good/Bad yet.")
-                else:
-                    total_feedback = len(feedback_df)
-                    helpful_count = (feedback_df['feedback_norm'] == 'helpful').sum()
-                    unhelpful_count = (feedback_df['feedback_norm'] == 'unhelpful').sum()
-
-                    helpful_rate = helpful_count / total_feedback * 100
-                    unhelpful_rate = unhelpful_count / total_feedback * 100
-
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        st.metric("Total Feedback", f"{total_feedback:,}")
-                    with col2:
-                        st.metric("Helpful Rate", f"{helpful_rate:.1f}%", delta=f"{helpful_count:,} responses")
-                    with col3:
-                        st.metric("Unhelpful Rate", f"{unhelpful_rate:.1f}%", delta=f"{unhelpful_count:,} responses")
-
-                    # Show reasons users gave for unhelpful responses
-                    feedback_df['feedback_reason'] = feedback_df.apply(extract_feedback_reason, axis=1)
-                    unhelpful_with_reason = feedback_df[
-                        (feedback_df['feedback_norm'] == 'unhelpful') &
-                        (feedback_df['feedback_reason'].notna())
-                    ].copy()
-
-                    if not unhelpful_with_reason.empty:
-                        st.markdown("#### 🗒️ Unhelpful Feedback Reasons")
-                        reason_cols = ['timestamp', 'country', 'Country', 'state', 'State',
-                                       'city', 'City', 'question', 'output', 'feedback_reason']
-                        available_reason_cols = [c for c in reason_cols if c in unhelpful_with_reason.columns]
-                        reason_view = unhelpful_with_reason[available_reason_cols].copy()
-                        if 'output' in reason_view.columns:
-                            reason_view['output'] = (
-                                reason_view['output']
-                                .astype(str)
-                                .str.replace('\n', ' ', regex=False)
-                                .str.replace('\r', ' ', regex=False)
-                            )
-                        reason_view = reason_view.rename(columns={
-                            'question': 'Question',
-                            'timestamp': 'Timestamp',
-                            'output': 'Chatbot Response',
-                            'feedback_reason': 'Reason',
-                            'country': 'Country',
-                            'state': 'State',
-                            'city': 'City',
-                        })
-                        st.dataframe(reason_view, width='stretch', hide_index=True)
-
-            # Sessions over time
-            if has_sessions and 'timestamp' in df.columns:
-                st.markdown("---")
-                st.markdown("#### 📈 Sessions Over Time")
-                session_time = df[df['session_id'].notna()].copy()
-                session_time['date'] = pd.to_datetime(session_time['timestamp'], format='ISO8601', errors='coerce').dt.date
-                daily_sessions = session_time.groupby('date')['session_id'].nunique().reset_index(name='sessions')
-
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(
-                    x=daily_sessions['date'],
-                    y=daily_sessions['sessions'],
-                    mode='lines+markers',
-                    line=dict(color=BYU_COLORS['primary'], width=2),
-                    hovertemplate='%{x}<br>Sessions: %{y}<extra></extra>'
-                ))
-                fig.update_layout(
-                    title="Daily Unique Sessions",
-                    xaxis_title="Date",
-                    yaxis_title="Unique Sessions",
-                    height=350,
-                    showlegend=False
-                )
-                st.plotly_chart(fig, width='stretch', key="sessions_over_time")
+            _render_user_session_tab(df, data_version, aggs, has_sessions)
 
     # ── TAB 2: General Feedback ──
     with tab2:
@@ -266,46 +466,7 @@ def main():
             it will appear here as a searchable table.
             """)
         else:
-            st.markdown("### 📋 General Feedback Submissions")
-
-            gf_df = raw_data['general_feedback'].copy()
-            st.metric("Total Submissions", f"{len(gf_df):,}")
-
-            # Keep table simple: hide technical/redundant columns
-            hidden_cols = ['id', 'trace_id', 'name', 'output', 'tags']
-            display_cols = [c for c in gf_df.columns if c not in hidden_cols]
-
-            search = st.text_input("🔍 Search feedback", placeholder="Type to filter...", key="gf_search")
-            if search:
-                mask = gf_df.apply(lambda row: search.lower() in str(row.values).lower(), axis=1)
-                gf_df = gf_df[mask]
-
-            if display_cols:
-                st.dataframe(gf_df[display_cols], width='stretch', hide_index=True)
-            else:
-                st.dataframe(gf_df, width='stretch', hide_index=True)
-
-            if 'timestamp' in gf_df.columns and len(gf_df) > 1:
-                st.markdown("#### 📈 Submissions Over Time")
-                gf_df['date'] = pd.to_datetime(gf_df['timestamp'], errors='coerce').dt.date
-                daily_gf = gf_df.groupby('date').size().reset_index(name='count')
-
-                fig = go.Figure()
-                fig.add_trace(go.Bar(
-                    x=daily_gf['date'],
-                    y=daily_gf['count'],
-                    marker=dict(color=BYU_COLORS['primary']),
-                    text=daily_gf['count'],
-                    textposition='outside'
-                ))
-                fig.update_layout(
-                    title="Daily Feedback Submissions",
-                    xaxis_title="Date",
-                    yaxis_title="Submissions",
-                    height=350,
-                    showlegend=False
-                )
-                st.plotly_chart(fig, width='stretch', key="gf_over_time")
+            _render_general_feedback_tab(raw_data['general_feedback'], data_version)
 
     # ── TAB 3: Feature Events ──
     with tab3:
@@ -317,18 +478,7 @@ def main():
             from normal user questions so they do not affect topic modelling.
             """)
         else:
-            st.markdown("### 🧩 Feature Events")
-            events_df = raw_data['feature_events'].copy()
-            st.metric("Total Events", f"{len(events_df):,}")
-
-            if 'name' in events_df.columns:
-                counts = events_df['name'].fillna('unknown').value_counts().reset_index()
-                counts.columns = ['Event Type', 'Count']
-                st.dataframe(counts, width='stretch', hide_index=True)
-
-            hidden_cols = ['id', 'metadata', 'tags']
-            display_cols = [c for c in events_df.columns if c not in hidden_cols]
-            st.dataframe(events_df[display_cols], width='stretch', hide_index=True)
+            _render_feature_events_tab(raw_data['feature_events'])
 
 
 if __name__ == "__main__":
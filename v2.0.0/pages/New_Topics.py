@@ -10,7 +10,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config import COLUMN_DISPLAY_NAMES, PAGE_CONFIG, get_theme_css
-from utils.data_loader import ensure_data_loaded
+from utils.data_loader import ensure_data_loaded, flatten_newlines
 
 # Configure page settings (needed for direct page access)
 st.set_page_config(**PAGE_CONFIG)
@@ -157,7 +157,7 @@ def main():
         # Clean output column for CSV downloads
         display_topic_questions = topic_questions.copy()
         if 'output' in display_topic_questions.columns:
-            display_topic_questions['output'] = display_topic_questions['output'].astype(str).str.replace('\n', ' ', regex=False).str.replace('\r', ' ', regex=False)
+            display_topic_questions['output'] = flatten_newlines(display_topic_questions['output'])
         
         st.dataframe(
             display_topic_questions,
@@ -179,7 +179,7 @@ def main():
     
     # Clean representative_question column for CSV downloads
     if 'Representative Question' in display_df.columns:
-        display_df['Representative Question'] = display_df['Representative Question'].astype(str).str.replace('\n', ' ', regex=False).str.replace('\r', ' ', regex=False)
+        display_df['Representative Question'] = flatten_newlines(display_df['Representative Question'])
     
     st.dataframe(
         display_df,
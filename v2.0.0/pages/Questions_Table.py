@@ -7,12 +7,11 @@ import pandas as pd
 from datetime import datetime, timedelta
 import sys
 from pathlib import Path
-import re
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config import CLASSIFICATION_OPTIONS, PAGE_CONFIG, SOURCE_TYPE_LABELS, get_theme_css
-from utils.data_loader import filter_dataframe, ensure_data_loaded
+from utils.data_loader import filter_dataframe, ensure_data_loaded, flatten_newlines
 
 
 # Fallback / refusal patterns for detecting unanswered questions.
@@ -72,18 +71,17 @@ FALLBACK_MESSAGE_PATTERNS = [
 ]
 
 
-def is_unanswered_question(output_text: str) -> bool:
-    """Check if the chatbot output contains a refusal / 'cannot answer' message.
+# All patterns as one case-insensitive alternation, so the column is scanned once
+FALLBACK_MESSAGE_REGEX = '|'.join(f'(?:{pattern})' for pattern in FALLBACK_MESSAGE_PATTERNS)
+
+
+def is_unanswered_question(outputs: pd.Series) -> pd.Series:
+    """Flag chatbot outputs that contain a refusal / 'cannot answer' message.
 
     This is used as a runtime fallback when the pre-computed is_not_answered
-    column is not available in the data.
+    column is not available in the data. Missing outputs are never flagged.
     """
-    if pd.isna(output_text) or not isinstance(output_text, str):
-        return False
-    for pattern in FALLBACK_MESSAGE_PATTERNS:
-        if re.search(pattern, output_text, re.IGNORECASE):
-            return True
-    return False
+    return outputs.astype('string').str.contains(FALLBACK_MESSAGE_REGEX, case=False, regex=True, na=False)
 
 # Configure page settings (needed for direct page access)
 st.set_page_config(**PAGE_CONFIG)
@@ -102,7 +100,8 @@ def main():
     # Ensure data is loaded (handles page refresh)
     ensure_data_loaded()
     
-    df = st.session_state['merged_df'].copy()
+    # Read-only reference; filter_dataframe and the display code build their own frames
+    df = st.session_state['merged_df']
     
     # Filters in main page area
     st.markdown("## 🔍 Filters")
@@ -237,9 +236,7 @@ def main():
             filtered_df = filtered_df[filtered_df['is_not_answered'] == True].copy()
         elif 'output' in filtered_df.columns:
             # Runtime fallback for older data without pre-computed column
-            filtered_df['_unanswered'] = filtered_df['output'].apply(is_unanswered_question)
-            filtered_df = filtered_df[filtered_df['_unanswered'] == True].copy()
-            filtered_df = filtered_df.drop(columns=['_unanswered'])
+            filtered_df = filtered_df[is_unanswered_question(filtered_df['output'])].copy()
     
     # Results count
     st.markdown(f"### 📊 Showing {len(filtered_df):,} of {len(df):,} questions")
@@ -250,11 +247,15 @@ def main():
         display_df = filtered_df.copy()
 
         # Hide internal/technical columns from stakeholder-facing table
+        # (underscore-prefixed columns are loader-internal flags such as _has_cost)
         hidden_columns = ['tags', 'scores', 'release', 'role']
-        display_df = display_df.drop(columns=[c for c in hidden_columns if c in display_df.columns], errors='ignore')
+        display_df = display_df.drop(
+            columns=[c for c in display_df.columns if c in hidden_columns or str(c).startswith('_')],
+            errors='ignore'
+        )
 
         if 'output' in display_df.columns:
-            display_df['output'] = display_df['output'].astype(str).str.replace('\n', ' ', regex=False).str.replace('\r', ' ', regex=False)
+            display_df['output'] = flatten_newlines(display_df['output'])
         
         st.dataframe(
             display_df,
@@ -291,7 +292,7 @@ def main():
                 if 'is_not_answered' in filtered_df.columns:
                     unanswered_mask = filtered_df['is_not_answered'] == True
                 else:
-                    unanswered_mask = filtered_df['output'].apply(is_unanswered_question)
+                    unanswered_mask = is_unanswered_question(filtered_df['output'])
                 unanswered_count = unanswered_mask.sum()
                 unanswered_pct = (unanswered_count / len(filtered_df) * 100) if len(filtered_df) > 0 else 0
                 
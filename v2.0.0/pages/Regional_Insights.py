@@ -13,7 +13,7 @@ from config import PAGE_CONFIG, get_theme_css, BYU_COLORS
 from utils.data_loader import ensure_data_loaded
 from utils.visualizations import (
     plot_regional_topic_preferences, plot_feedback_quality_by_region,
-    plot_country_distribution
+    plot_country_distribution, normalize_feedback_labels
 )
 import plotly.graph_objects as go
 import plotly.express as px
@@ -47,9 +47,8 @@ def plot_regional_heatmap(df: pd.DataFrame, metric: str = 'count', key: str = "r
     if metric == 'count':
         pivot_data = df_filtered.groupby(['country', 'state']).size().reset_index(name='value')
     elif metric == 'unhelpful_rate' and 'user_feedback' in df.columns:
-        from utils.visualizations import _normalize_feedback
         fb_df = df_filtered.copy()
-        fb_df['feedback_norm'] = fb_df['user_feedback'].apply(_normalize_feedback)
+        fb_df['feedback_norm'] = normalize_feedback_labels(fb_df['user_feedback'])
         fb_df = fb_df[fb_df['feedback_norm'].notna()]
         pivot_data = fb_df.groupby(['country', 'state']).agg({
             'feedback_norm': lambda x: (x == 'unhelpful').sum() / len(x) * 100 if len(x) > 0 else 0
@@ -62,10 +61,14 @@ def plot_regional_heatmap(df: pd.DataFrame, metric: str = 'count', key: str = "r
         st.info(f"Metric '{metric}' not available")
         return
     
-    # Get top states per country
-    top_states_per_country = pivot_data.groupby('country').apply(
-        lambda x: x.nlargest(5, 'value')
-    ).reset_index(drop=True)
+    # Get top states per country (one stable sort, then the first 5 rows of each country;
+    # ties keep their original order, as nlargest does)
+    top_states_per_country = (
+        pivot_data.dropna(subset=['value'])
+        .sort_values('value', ascending=False, kind='stable')
+        .groupby('country', sort=False)
+        .head(5)
+    )
     
     if top_states_per_country.empty:
         st.info("Insufficient data for regional heatmap")
@@ -243,13 +246,11 @@ def main():
     
     with col4:
         if 'user_feedback' in df.columns:
-            from utils.visualizations import _normalize_feedback
-            feedback_df = df[df['user_feedback'].notna()].copy()
-            feedback_df['feedback_norm'] = feedback_df['user_feedback'].apply(_normalize_feedback)
-            feedback_df = feedback_df[feedback_df['feedback_norm'].notna()]
-            if not feedback_df.empty:
-                helpful_count = (feedback_df['feedback_norm'] == 'helpful').sum()
-                total_feedback = len(feedback_df)
+            # Only the labels are needed here; missing feedback normalizes to NaN and is dropped
+            feedback_norm = normalize_feedback_labels(df['user_feedback']).dropna()
+            if not feedback_norm.empty:
+                helpful_count = (feedback_norm == 'helpful').sum()
+                total_feedback = len(feedback_norm)
                 helpful_rate = (helpful_count / total_feedback * 100)
                 st.metric(
                     label="✅ Overall Helpful Rate",
@@ -293,7 +294,8 @@ def main():
             if 'user_language' in df.columns and df['user_language'].notna().any():
                 st.markdown("#### Language Distribution")
                 
-                lang_country = df[df['user_language'].notna()].groupby(['country', 'user_language']).size().reset_index(name='count')
+                # groupby drops rows with a missing key, so no separate notna() filter is needed
+                lang_country = df.groupby(['country', 'user_language']).size().reset_index(name='count')
                 top_countries_lang = df['country'].value_counts().head(10).index
                 lang_country_filtered = lang_country[lang_country['country'].isin(top_countries_lang)]
                 
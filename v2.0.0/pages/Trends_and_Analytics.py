@@ -15,7 +15,7 @@ from utils.visualizations import (
     plot_timeline, plot_similarity_distribution, plot_top_topics,
     plot_hourly_heatmap, plot_language_distribution,
     plot_sentiment_distribution, identify_repeat_questions, 
-    plot_activity_heatmap_with_insights
+    plot_activity_heatmap_with_insights, normalize_feedback_labels, extract_feedback_reasons
 )
 
 # Configure page settings (needed for direct page access)
@@ -297,7 +297,7 @@ def main():
             
             if search_term:
                 filtered_sentiment_df = filtered_sentiment_df[
-                    filtered_sentiment_df['question'].str.contains(search_term, case=False, na=False)
+                    filtered_sentiment_df['question'].str.contains(search_term, case=False, regex=False, na=False)
                 ]
             
             # Show count
@@ -350,50 +350,11 @@ def main():
             st.markdown("#### ⭐ Response Quality Analysis")
             st.markdown("Analyzing user feedback to improve response quality.")
             
-            feedback_df = df[df['user_feedback'].notna()].copy()
-
-            # Normalize feedback labels from different source conventions
-            feedback_map = {
-                'good': 'helpful',
-                'helpful': 'helpful',
-                'thumbs_up': 'helpful',
-                'positive': 'helpful',
-                '1': 'helpful',
-                'true': 'helpful',
-                'yes': 'helpful',
-                'bad': 'unhelpful',
-                'unhelpful': 'unhelpful',
-                'thumbs_down': 'unhelpful',
-                'negative': 'unhelpful',
-                '-1': 'unhelpful',
-                'false': 'unhelpful',
-                'no': 'unhelpful'
-            }
-
-            feedback_df['feedback_norm'] = (
-                feedback_df['user_feedback']
-                .astype(str)
-                .str.strip()
-                .str.lower()
-                .map(feedback_map)
-            )
-            feedback_df = feedback_df[feedback_df['feedback_norm'].notna()]
-
-            # Feedback reason/comment from new traces format (or legacy "Bad: reason" values)
-            if 'feedback_comment' in feedback_df.columns:
-                feedback_df['feedback_reason'] = feedback_df['feedback_comment']
-            else:
-                feedback_df['feedback_reason'] = None
-
-            legacy_reason_mask = feedback_df['feedback_reason'].isna() & feedback_df['user_feedback'].astype(str).str.contains(':', regex=False)
-            if legacy_reason_mask.any():
-                feedback_df.loc[legacy_reason_mask, 'feedback_reason'] = (
-                    feedback_df.loc[legacy_reason_mask, 'user_feedback']
-                    .astype(str)
-                    .str.split(':', n=1)
-                    .str[1]
-                    .str.strip()
-                )
+            # Normalize feedback labels from different source conventions; missing and
+            # unrecognized values become NaN, so one mask selects the labelled rows
+            feedback_norm = normalize_feedback_labels(df['user_feedback'])
+            labelled = feedback_norm.notna()
+            feedback_df = df[labelled].assign(feedback_norm=feedback_norm[labelled])
 
             if feedback_df.empty:
                 st.info("Feedback exists, but no recognized Good/Bad labels were found.")
@@ -449,22 +410,28 @@ def main():
                         - Use successful responses as templates
                         """)
 
-                unhelpful_reasons = feedback_df[
-                    (feedback_df['feedback_norm'] == 'unhelpful') &
-                    (feedback_df['feedback_reason'].notna())
-                ]
+                # Feedback reason/comment from new traces format (or legacy "Bad: reason" values),
+                # extracted only for the unhelpful rows that are shown
+                unhelpful_df = feedback_df[feedback_df['feedback_norm'] == 'unhelpful']
+                reasons = extract_feedback_reasons(unhelpful_df)
+                unhelpful_reasons = unhelpful_df[reasons.notna()].assign(feedback_reason=reasons)
                 if not unhelpful_reasons.empty:
                     st.markdown("**Recent Unhelpful Feedback Reasons:**")
                     display_cols = [c for c in ['timestamp', 'question', 'feedback_reason'] if c in unhelpful_reasons.columns]
-                    reason_df = unhelpful_reasons[display_cols].copy().head(20)
-                    if 'question' in reason_df.columns:
-                        reason_df['question'] = reason_df['question'].astype(str).str.slice(0, 140)
-                    reason_df = reason_df.rename(columns={
+                    # Long questions are clipped by the grid cell, not by a sliced copy of the column
+                    reason_df = unhelpful_reasons[display_cols].head(20).rename(columns={
                         'timestamp': 'Timestamp',
                         'question': 'Question',
                         'feedback_reason': 'Reason'
                     })
-                    st.dataframe(reason_df, width='stretch', hide_index=True)
+                    st.dataframe(
+                        reason_df,
+                        width='stretch',
+                        hide_index=True,
+                        column_config={
+                            'Question': st.column_config.TextColumn('Question', width='large')
+                        }
+                    )
 
     
     # Footer
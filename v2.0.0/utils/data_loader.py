@@ -5,37 +5,147 @@ Utility functions for data loading and processing
 import streamlit as st
 import pandas as pd
 import boto3
+import pyarrow as pa
+import pyarrow.parquet as pq
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
+import hashlib
 import json
-from io import BytesIO
 import os
 
 
-@st.cache_data(ttl=3600, show_spinner="Loading data from S3...")
-def load_data_from_s3() -> Dict[str, pd.DataFrame]:
+# Columns merge_data_for_dashboard takes from similar_questions when pathway_questions_review exists
+SIMILAR_QUESTIONS_MERGE_COLUMNS = ['question', 'similarity_score']
+
+# Files whose rows are limited to the selected history window (see get_data_cutoff)
+WINDOWED_FILE_TYPES = {'pathway_questions_review', 'general_feedback'}
+
+# Repeated-value columns the pages count, group and normalize; stored as categoricals
+# (see _categorize_columns)
+CATEGORICAL_COLUMNS = ('session_id', 'user_id', 'user_feedback')
+
+# Parquet text columns load as Arrow-backed strings; other types keep their NumPy dtypes
+_ARROW_STRING = pd.StringDtype('pyarrow')
+_ARROW_STRING_TYPES = {
+    pa.string(): _ARROW_STRING,
+    pa.large_string(): _ARROW_STRING,
+}
+
+
+@st.cache_resource(show_spinner=False)
+def _get_s3_client():
+    """
+    Create the S3 client once per process.
+    Shared across reruns and sessions so connections and auth are reused.
+    """
+    # Import config values here (after Streamlit has initialized)
+    from config import AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_REGION
+    
+    return boto3.client(
+        's3',
+        aws_access_key_id=AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+        region_name=AWS_REGION
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def _get_arrow_s3_filesystem():
+    """
+    Create pyarrow's native S3 filesystem once per process.
+    Parquet reads go through it so column selection turns into ranged GETs.
+    """
+    from pyarrow import fs
+    # Import config values here (after Streamlit has initialized)
+    from config import AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_REGION
+    
+    return fs.S3FileSystem(
+        access_key=AWS_ACCESS_KEY_ID,
+        secret_key=AWS_SECRET_ACCESS_KEY,
+        region=AWS_REGION
+    )
+
+
+def _read_parquet_from_s3(key: str, columns: Optional[List[str]] = None, since: Optional[str] = None) -> pd.DataFrame:
+    """
+    Read a parquet object from S3 with pyarrow's native filesystem.
+    Requested columns missing from the file are ignored; if none exist, every column is read.
+    With since (YYYY-MM-DD), only rows with timestamp >= since are read; row groups
+    whose statistics fall entirely before it are skipped.
+    """
+    from config import AWS_S3_BUCKET
+    
+    filesystem = _get_arrow_s3_filesystem()
+    path = f"{AWS_S3_BUCKET}/{key}"
+    filters = None
+    if columns is not None or since is not None:
+        schema = pq.read_schema(path, filesystem=filesystem)
+        if columns is not None:
+            columns = [col for col in columns if col in schema.names] or None
+        if since is not None and 'timestamp' in schema.names:
+            ts_type = schema.field('timestamp').type
+            if pa.types.is_timestamp(ts_type):
+                bound = pd.Timestamp(since)
+                if ts_type.tz is not None:
+                    bound = bound.tz_localize(ts_type.tz)
+                filters = [('timestamp', '>=', bound.to_pydatetime())]
+            elif pa.types.is_string(ts_type) or pa.types.is_large_string(ts_type):
+                # ISO 8601 strings order the same way as the instants they encode
+                filters = [('timestamp', '>=', since)]
+    table = pq.read_table(path, filesystem=filesystem, columns=columns, filters=filters)
+    return table.to_pandas(types_mapper=_ARROW_STRING_TYPES.get)
+
+
+def get_data_cutoff() -> Optional[str]:
+    """
+    Start date (YYYY-MM-DD, UTC) of the history window selected in the sidebar,
+    or None when the full history is selected.
+    """
+    from config import DATA_WINDOW_OPTIONS, DEFAULT_DATA_WINDOW
+    
+    window = st.session_state.get('data_window', DEFAULT_DATA_WINDOW)
+    days = DATA_WINDOW_OPTIONS.get(window)
+    if days is None:
+        return None
+    cutoff = pd.Timestamp.now(tz='UTC').normalize() - pd.Timedelta(days=days)
+    return cutoff.strftime('%Y-%m-%d')
+
+
+def load_data_from_s3(since: Optional[str] = None) -> Dict[str, pd.DataFrame]:
     """
     Load all parquet files from S3.
     Returns a dictionary of DataFrames.
+    since (see get_data_cutoff) limits question and feedback rows to that date onward.
+    """
+    return _load_s3_snapshot(since)[0]
+
+
+def _snapshot_version(files: List[dict]) -> str:
+    """Stable identifier for the set of S3 objects a load read (key, last modified, size)."""
+    ids = sorted(f"{f['key']}|{f['last_modified']}|{f['size']}" for f in files)
+    return hashlib.md5('\n'.join(ids).encode()).hexdigest()
+
+
+@st.cache_data(ttl=3600, max_entries=4, show_spinner=False)
+def _load_s3_snapshot(since: Optional[str] = None) -> Tuple[Dict[str, pd.DataFrame], Optional[str]]:
+    """
+    Load the most recent file of each type from S3, plus the version of the files read.
+    The data and its version come from one cache entry, so they always describe the same snapshot.
+    The version is None when nothing could be listed.
     """
     # Import config values here (after Streamlit has initialized)
     from config import (
         AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_S3_BUCKET, 
-        AWS_S3_PREFIX, AWS_REGION, FILE_PATTERNS
+        AWS_S3_PREFIX, FILE_PATTERNS
     )
     
     try:
         # Debug: Check if credentials are loaded
         if not AWS_ACCESS_KEY_ID or not AWS_SECRET_ACCESS_KEY:
             st.error(f"❌ AWS credentials not loaded. Access Key: {'SET' if AWS_ACCESS_KEY_ID else 'EMPTY'}, Secret Key: {'SET' if AWS_SECRET_ACCESS_KEY else 'EMPTY'}")
-            return {}
+            return {}, None
         
-        s3_client = boto3.client(
-            's3',
-            aws_access_key_id=AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-            region_name=AWS_REGION
-        )
+        s3_client = _get_s3_client()
         
         data = {}
         
@@ -47,7 +157,7 @@ def load_data_from_s3() -> Dict[str, pd.DataFrame]:
         
         if 'Contents' not in response:
             st.warning("No files found in S3 bucket.")
-            return data
+            return data, None
         
         # Get the most recent file for each pattern
         file_groups = {key: [] for key in FILE_PATTERNS.keys()}
@@ -74,6 +184,7 @@ def load_data_from_s3() -> Dict[str, pd.DataFrame]:
                         })
         
         # Load the most recent file for each type
+        read_files = []
         for file_type, files in file_groups.items():
             if not files:
                 continue
@@ -81,6 +192,7 @@ def load_data_from_s3() -> Dict[str, pd.DataFrame]:
             # Sort by last_modified descending
             files.sort(key=lambda x: x['last_modified'], reverse=True)
             most_recent = files[0]
+            read_files.append(most_recent)
             
             # Load error_log JSON files separately (don't skip them)
             if file_type == "error_log":
@@ -95,31 +207,32 @@ def load_data_from_s3() -> Dict[str, pd.DataFrame]:
             # Load general_feedback parquet files
             if file_type == "general_feedback":
                 try:
-                    obj = s3_client.get_object(Bucket=AWS_S3_BUCKET, Key=most_recent['key'])
-                    buffer = BytesIO(obj['Body'].read())
-                    df = pd.read_parquet(buffer)
-                    data[file_type] = df
+                    data[file_type] = _read_parquet_from_s3(most_recent['key'], since=since)
                 except Exception as e:
                     # General feedback may not exist yet - not an error
                     pass
                 continue
             
             try:
-                # Download and read parquet file
-                # Must read into BytesIO buffer because pandas needs seekable stream
-                obj = s3_client.get_object(Bucket=AWS_S3_BUCKET, Key=most_recent['key'])
-                buffer = BytesIO(obj['Body'].read())
-                df = pd.read_parquet(buffer)
-                data[file_type] = df
+                # Read parquet file straight from S3 (only the needed column chunks are fetched)
+                columns = None
+                if file_type == "similar_questions" and file_groups.get("pathway_questions_review"):
+                    # With the review file present, only these two columns are merged in
+                    columns = SIMILAR_QUESTIONS_MERGE_COLUMNS
+                data[file_type] = _read_parquet_from_s3(
+                    most_recent['key'],
+                    columns=columns,
+                    since=since if file_type in WINDOWED_FILE_TYPES else None
+                )
                 
             except Exception as e:
                 st.error(f"Error loading {file_type}: {str(e)}")
         
-        return data
+        return data, _snapshot_version(read_files)
         
     except Exception as e:
         st.error(f"Error connecting to S3: {str(e)}")
-        return {}
+        return {}, None
 
 
 @st.cache_data(ttl=3600)
@@ -128,18 +241,10 @@ def get_latest_file_info() -> Dict[str, any]:
     Get information about the latest files in S3.
     """
     # Import config values here (after Streamlit has initialized)
-    from config import (
-        AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_S3_BUCKET, 
-        AWS_S3_PREFIX, AWS_REGION
-    )
+    from config import AWS_S3_BUCKET, AWS_S3_PREFIX
     
     try:
-        s3_client = boto3.client(
-            's3',
-            aws_access_key_id=AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-            region_name=AWS_REGION
-        )
+        s3_client = _get_s3_client()
         
         response = s3_client.list_objects_v2(
             Bucket=AWS_S3_BUCKET,
@@ -168,9 +273,98 @@ def get_latest_file_info() -> Dict[str, any]:
         return {}
 
 
-def merge_data_for_dashboard(data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+def get_data_version(since: Optional[str] = None) -> str:
+    """
+    Identify the S3 snapshot returned by load_data_from_s3(since) and the history window.
+    Used as the cache key for data derived from it. Read from the same cache entry as the
+    data, so the key cannot describe a different snapshot than the frames it labels.
+    """
+    # The window is always part of the key, even when the snapshot is unknown
+    snapshot_version = _load_s3_snapshot(since)[1]
+    return f"{snapshot_version or 'unknown'}|{since or 'all'}"
+
+
+def _downcast_metrics(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Store cost and latency as float32.
+    The dashboard shows these with at most 8 decimal places, well within float32
+    precision, and halving their width speeds up every aggregation over them.
+    """
+    for col in ('total_cost', 'latency'):
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce', downcast='float')
+    return df
+
+
+def _categorize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Store session/user IDs and feedback values as categoricals.
+    Each distinct string is kept once; nunique/value_counts run on small integer codes
+    and feedback labels are normalized per distinct value.
+    """
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+
+def _add_metric_flags(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add bool _has_cost/_has_latency columns marking rows with a real (> 0) value.
+    Missing values and the -1 sentinel are False; pages filter on these instead of
+    re-comparing the float columns on every rerun.
+    """
+    for col, flag in (('total_cost', '_has_cost'), ('latency', '_has_latency')):
+        if col in df.columns:
+            df[flag] = df[col] > 0
+    return df
+
+
+def parse_timestamps(values: pd.Series) -> pd.Series:
+    """
+    Parse a timestamp column to datetime64.
+    Uniform ISO 8601 strings go through Arrow's vectorized string-to-timestamp cast (zoned
+    strings become UTC, naive strings stay naive); anything else falls back to pandas' ISO8601 parser.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    try:
+        arr = pa.array(values, type=pa.string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        arr = None
+    if arr is not None and arr.null_count < len(arr):
+        for ts_type in (pa.timestamp('us', tz='UTC'), pa.timestamp('us')):
+            try:
+                parsed = arr.cast(ts_type).to_pandas()
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                continue
+            parsed.index = values.index
+            parsed.name = values.name
+            return parsed
+    # Mixed formats, blanks or unparseable values: invalid entries become NaT
+    return pd.to_datetime(values, format='ISO8601', errors='coerce')
+
+
+def merge_data_for_dashboard(data: Dict[str, pd.DataFrame], data_version: Optional[str] = None) -> pd.DataFrame:
     """
     Merge data for the main dashboard view.
+    Cached per data_version (see get_data_version); the raw data dict is not hashed,
+    so without a version the merge runs uncached.
+    """
+    if data_version is None:
+        return _merge_data(data)
+    return _cached_merge_data(data, data_version)
+
+
+@st.cache_data(ttl=3600, max_entries=4, show_spinner=False)
+def _cached_merge_data(_data: Dict[str, pd.DataFrame], data_version: str) -> pd.DataFrame:
+    """_merge_data keyed by data_version."""
+    return _merge_data(_data)
+
+
+def _merge_data(data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Merge the loaded files into one frame of questions.
     Primary source is pathway_questions_review which has ALL questions.
     """
     # Use pathway_questions_review as primary source (has all questions)
@@ -185,7 +379,8 @@ def merge_data_for_dashboard(data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
         }
         if 'classification' in df.columns:
             mapped = df['classification'].map(classification_map)
-            df['classification'] = mapped.fillna(df['classification'])
+            # map() returns object dtype; keep the column Arrow-backed like the rest of the text
+            df['classification'] = mapped.fillna(df['classification']).astype(_ARROW_STRING)
         
         # For consistency, rename topic_name to matched_topic for existing topics
         if 'topic_name' in df.columns:
@@ -195,8 +390,8 @@ def merge_data_for_dashboard(data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
             df = df.drop(columns=['topic_name'])
         
         # Add similarity score from similar_questions if available
-        if 'similar_questions' in data and {'question', 'similarity_score'}.issubset(data['similar_questions'].columns):
-            similar_df = data['similar_questions'][['question', 'similarity_score']].copy()
+        if 'similar_questions' in data and set(SIMILAR_QUESTIONS_MERGE_COLUMNS).issubset(data['similar_questions'].columns):
+            similar_df = data['similar_questions'][SIMILAR_QUESTIONS_MERGE_COLUMNS].copy()
             # Keep only the highest similarity score for each question (in case of duplicates)
             similar_df = similar_df.sort_values('similarity_score', ascending=False).drop_duplicates('question', keep='first')
             df = df.merge(similar_df, on='question', how='left')
@@ -213,8 +408,8 @@ def merge_data_for_dashboard(data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
         
         # Ensure timestamp is datetime if it exists
         if 'timestamp' in df.columns:
-            # Use format='ISO8601' to handle various ISO 8601 formats (with/without microseconds)
-            df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601', errors='coerce')
+            # Handles the ISO 8601 variants in the files (with/without microseconds, with/without zone)
+            df['timestamp'] = parse_timestamps(df['timestamp'])
 
         # Source type existed before tuition; keep old files working and normalize blanks.
         if 'source_type' not in df.columns:
@@ -223,7 +418,7 @@ def merge_data_for_dashboard(data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
             df['source_type'] = (
                 df['source_type']
                 .fillna('rag')
-                .astype(str)
+                .astype(_ARROW_STRING)
                 .str.strip()
                 .str.lower()
                 .replace({'': 'rag', 'tuition journey': 'tuition_journey', 'draft-edit': 'draft_edit'})
@@ -238,7 +433,7 @@ def merge_data_for_dashboard(data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
             if before_dedup > after_dedup:
                 print(f"⚠️ Removed {before_dedup - after_dedup} duplicate rows during dashboard merge")
         
-        return df
+        return _add_metric_flags(_categorize_columns(_downcast_metrics(df)))
     
     # Fallback to old logic if pathway_questions_review doesn't exist
     dfs = []
@@ -267,20 +462,35 @@ def merge_data_for_dashboard(data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
     
     # Ensure timestamp is datetime
     if 'timestamp' in merged_df.columns:
-        # Use format='ISO8601' to handle various ISO 8601 formats (with/without microseconds)
-        merged_df['timestamp'] = pd.to_datetime(merged_df['timestamp'], format='ISO8601', errors='coerce')
+        # Already datetime64 unless the frames above ended up with different time zones
+        merged_df['timestamp'] = parse_timestamps(merged_df['timestamp'])
     
     # Sort by timestamp descending (newest first)
     if 'timestamp' in merged_df.columns:
         merged_df = merged_df.sort_values('timestamp', ascending=False)
     
-    return merged_df
+    return _add_metric_flags(_categorize_columns(_downcast_metrics(merged_df)))
 
 
-def calculate_kpis(merged_df: pd.DataFrame, data: Dict[str, pd.DataFrame]) -> Dict[str, any]:
+def calculate_kpis(merged_df: pd.DataFrame, data: Dict[str, pd.DataFrame], data_version: Optional[str] = None) -> Dict[str, any]:
     """
     Calculate Key Performance Indicators for the dashboard.
+    Cached per data_version (see get_data_version); the frames are not hashed,
+    so without a version the KPIs are computed uncached.
     """
+    if data_version is None:
+        return _calculate_kpis(merged_df, data)
+    return _cached_kpis(merged_df, data, data_version)
+
+
+@st.cache_data(ttl=3600, max_entries=4, show_spinner=False)
+def _cached_kpis(_merged_df: pd.DataFrame, _data: Dict[str, pd.DataFrame], data_version: str) -> Dict[str, any]:
+    """_calculate_kpis keyed by data_version."""
+    return _calculate_kpis(_merged_df, _data)
+
+
+def _calculate_kpis(merged_df: pd.DataFrame, data: Dict[str, pd.DataFrame]) -> Dict[str, any]:
+    """Compute the KPI dict from the merged frame and the loaded files."""
     kpis = {
         'total_questions': len(merged_df),
         'matched_existing': len(merged_df[merged_df['classification'] == 'Existing Topic']) if 'classification' in merged_df.columns else 0,
@@ -361,8 +571,9 @@ def filter_dataframe(
     """
     Apply filters to the dataframe.
     All filtering is done in-memory on cached data for instant results.
+    Returns df itself when no filter applies; copy before mutating the result.
     """
-    filtered_df = df.copy()
+    filtered_df = df
     
     # Classification filter
     if classification != "All" and 'classification' in filtered_df.columns:
@@ -394,13 +605,13 @@ def filter_dataframe(
             filtered_df['source_type'].fillna('rag').astype(str).str.lower().isin(source_types)
         ]
     
-    # Search filter (searches in question text)
+    # Search filter (literal, case-insensitive match in question text)
     if search_query:
         # Try 'question' column first (used in merged data), fallback to 'input'
         search_column = 'question' if 'question' in filtered_df.columns else 'input'
         if search_column in filtered_df.columns:
             filtered_df = filtered_df[
-                filtered_df[search_column].str.contains(search_query, case=False, na=False)
+                filtered_df[search_column].str.contains(search_query, case=False, regex=False, na=False)
             ]
     
     # Similarity filter (only apply if min_similarity > 0 to avoid filtering out NaN values)
@@ -435,6 +646,14 @@ def format_timestamp(ts: pd.Timestamp) -> str:
     return ts.strftime("%Y-%m-%d %H:%M:%S")
 
 
+def flatten_newlines(values: pd.Series) -> pd.Series:
+    """
+    Replace line breaks with spaces so text stays on one line in tables and CSV downloads.
+    One regex pass over the column instead of a replace per character.
+    """
+    return values.astype(str).str.replace(r'[\r\n]', ' ', regex=True)
+
+
 def get_column_config(columns: List[str]) -> Dict[str, any]:
     """
     Get Streamlit column configuration for dataframe display.
@@ -475,8 +694,9 @@ def ensure_data_loaded():
     Call this at the start of every page to handle page refreshes.
     """
     if 'merged_df' not in st.session_state or 'raw_data' not in st.session_state or 'kpis' not in st.session_state:
+        since = get_data_cutoff()
         with st.spinner("🔄 Loading data from AWS S3..."):
-            data = load_data_from_s3()
+            data = load_data_from_s3(since)
         
         if not data:
             st.error("❌ **No data available.** Please ensure the notebook has uploaded files to S3.")
@@ -487,19 +707,21 @@ def ensure_data_loaded():
             st.stop()
         
         # Merge data for dashboard
-        merged_df = merge_data_for_dashboard(data)
+        data_version = get_data_version(since)
+        merged_df = merge_data_for_dashboard(data, data_version)
         
         if merged_df.empty:
             st.warning("⚠️ No question data available in the loaded files.")
             st.stop()
         
         # Calculate KPIs
-        kpis = calculate_kpis(merged_df, data)
+        kpis = calculate_kpis(merged_df, data, data_version)
         
         # Store in session state
         st.session_state['merged_df'] = merged_df
         st.session_state['raw_data'] = data
         st.session_state['kpis'] = kpis
+        st.session_state['data_version'] = data_version
 
 
 def generate_error_report(merged_df: pd.DataFrame, raw_data: Dict[str, pd.DataFrame]) -> str:
@@ -606,7 +828,7 @@ def generate_error_report(merged_df: pd.DataFrame, raw_data: Dict[str, pd.DataFr
     if 'timestamp' in merged_df.columns:
         report.write("\nTIMESTAMP ANALYSIS\n")
         report.write("-" * 80 + "\n")
-        timestamps = pd.to_datetime(merged_df['timestamp'], format='ISO8601', errors='coerce')
+        timestamps = parse_timestamps(merged_df['timestamp'])
         valid_timestamps = timestamps.dropna()
         if len(valid_timestamps) > 0:
             report.write(f"Valid timestamps: {len(valid_timestamps)}\n")
@@ -4,22 +4,124 @@ Visualization components for charts and analytics
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 from typing import Dict, List
 from config import BYU_COLORS, CHART_COLOR_PALETTE
 
 
-def _normalize_feedback(value):
-    """Map raw feedback values to helpful/unhelpful."""
-    if pd.isna(value):
-        return None
-    text = str(value).strip().lower()
-    if text in {'good', 'helpful', 'thumbs_up', 'positive', '1', 'true', 'yes'}:
-        return 'helpful'
-    if text in {'bad', 'unhelpful', 'thumbs_down', 'negative', '-1', 'false', 'no'}:
-        return 'unhelpful'
-    return None
+FEEDBACK_LABELS = {
+    **dict.fromkeys(('good', 'helpful', 'thumbs_up', 'positive', '1', 'true', 'yes'), 'helpful'),
+    **dict.fromkeys(('bad', 'unhelpful', 'thumbs_down', 'negative', '-1', 'false', 'no'), 'unhelpful'),
+}
+
+
+def normalize_feedback_labels(values: pd.Series) -> pd.Series:
+    """
+    Normalize feedback values into helpful/unhelpful buckets.
+    Vectorized: missing values are skipped by the string ops, unrecognized values become NaN.
+    Categorical input is normalized once per category and expanded by code.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        labels = normalize_feedback_labels(pd.Series(values.cat.categories))
+        # Code -1 (missing) has no label and reindexes to NaN
+        return labels.reindex(values.cat.codes.to_numpy()).set_axis(values.index).rename(values.name)
+    return values.astype('string').str.strip().str.lower().map(FEEDBACK_LABELS)
+
+
+def extract_feedback_reasons(df: pd.DataFrame) -> pd.Series:
+    """
+    Get feedback reasons from the new feedback_comment field or legacy "label: reason" user_feedback text.
+    Vectorized over the frame; rows without a reason are NA.
+    """
+    reasons = pd.Series(pd.NA, index=df.index, dtype='string')
+
+    if 'user_feedback' in df.columns:
+        legacy = df['user_feedback'].astype('string').str.extract(r'(?s):(.*)', expand=False).str.strip()
+        reasons = legacy.where(legacy != '').astype('string')
+
+    if 'feedback_comment' in df.columns:
+        comment = df['feedback_comment'].astype('string').str.strip()
+        reasons = comment.where(comment.notna() & (comment != ''), reasons)
+
+    return reasons
+
+
+def histogram_bar(values: pd.Series, bins: int = 50, **bar_kwargs) -> go.Bar:
+    """
+    Histogram as a pre-binned bar trace.
+    Binning with np.histogram sends one count per bin to the browser instead of every raw value.
+    Integer values spanning at most `bins` distinct numbers get one unit-wide bar per value (np.bincount).
+    `bins` may also be an array of edges, e.g. shared by several overlaid traces.
+    """
+    arr = values.to_numpy()
+    if isinstance(bins, int) and arr.dtype.kind in 'iu' and len(arr):
+        lo = arr.min()
+        if arr.max() - lo < bins:
+            counts = np.bincount(arr - lo)
+            return go.Bar(x=np.arange(lo, lo + len(counts)), y=counts, width=1, **bar_kwargs)
+    counts, edges = np.histogram(arr, bins=bins)
+    return go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        **bar_kwargs
+    )
+
+
+def downsample_lttb(x: np.ndarray, y: np.ndarray, max_points: int = 500) -> np.ndarray:
+    """
+    Positions of at most max_points points that keep the visual shape of a line
+    (Largest-Triangle-Three-Buckets). x must be numeric and sorted; the first and
+    last points are always kept. Shorter series are returned whole.
+    """
+    n = len(x)
+    if n <= max_points or max_points < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    keep = np.empty(max_points, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    # max_points - 2 buckets over the interior points
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    prev = 0
+    for i in range(max_points - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = (edges[i + 1], edges[i + 2]) if i < max_points - 3 else (n - 1, n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        # Pick the point forming the largest triangle with the previous pick and the next bucket's mean
+        area = np.abs(
+            (x[prev] - avg_x) * (y[start:end] - y[prev])
+            - (x[prev] - x[start:end]) * (avg_y - y[prev])
+        )
+        prev = start + int(np.argmax(area))
+        keep[i + 1] = prev
+    return keep
+
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def _figure_json(name: str, data_version, _builder, _args: tuple) -> str:
+    """
+    Plotly JSON for one chart, built once per data snapshot.
+    Only the chart name and data_version are hashed; the builder and its inputs are not.
+    """
+    return _builder(*_args).to_json()
+
+
+def show_figure(name: str, data_version, builder, *args):
+    """
+    Render a chart from its cached JSON (built directly when there is no data_version).
+    name is also the chart's widget key, so it must be unique across pages.
+    """
+    if data_version is None:
+        fig = builder(*args)
+    else:
+        fig = pio.from_json(_figure_json(name, data_version, builder, args))
+    st.plotly_chart(fig, width='stretch', key=name)
 
 
 def create_kpi_cards(kpis: Dict[str, any]):
@@ -243,9 +345,14 @@ def plot_similarity_distribution(df: pd.DataFrame):
         st.info("No similarity scores available for existing topics")
         return
     
-    fig = go.Figure(data=[go.Histogram(
-        x=df_filtered['similarity_score'],
-        nbinsx=30,
+    scores = df_filtered['similarity_score'].dropna()
+    if scores.empty:
+        st.info("No similarity scores available for existing topics")
+        return
+
+    fig = go.Figure(data=[histogram_bar(
+        scores,
+        bins=30,
         marker=dict(color=BYU_COLORS['primary']),
         hovertemplate='Similarity Score: %{x:.3f}<br>Count: %{y}<extra></extra>'
     )])
@@ -556,23 +663,24 @@ def plot_feedback_quality_by_region(df: pd.DataFrame, by: str = 'country', key:
         return None
     
     df_copy = df.copy()
-    df_copy['feedback_norm'] = df_copy['user_feedback'].apply(_normalize_feedback)
+    df_copy['feedback_norm'] = normalize_feedback_labels(df_copy['user_feedback'])
     df_copy = df_copy[df_copy['feedback_norm'].notna()]
     
     if df_copy.empty:
         st.info("No feedback data available")
         return None
     
-    # Calculate unhelpful rate by region
-    regional_feedback = df_copy.groupby(by).agg({
-        'feedback_norm': lambda x: (x == 'unhelpful').sum() / len(x) * 100 if len(x) > 0 else 0,
-        'question': 'count'
-    }).reset_index()
-    regional_feedback.columns = [by, 'unhelpful_rate', 'total_feedback']
+    # Calculate unhelpful rate by region (mean of a bool column, no per-group Python lambda)
+    df_copy['is_unhelpful'] = df_copy['feedback_norm'] == 'unhelpful'
+    regional_feedback = df_copy.groupby(by, observed=True).agg(
+        unhelpful_rate=('is_unhelpful', 'mean'),
+        total_feedback=('question', 'count')
+    )
+    regional_feedback['unhelpful_rate'] *= 100
     
-    # Filter regions with at least 10 feedback responses
+    # Filter regions with at least 10 feedback responses, then keep the 15 worst
     regional_feedback = regional_feedback[regional_feedback['total_feedback'] >= 10]
-    regional_feedback = regional_feedback.sort_values('unhelpful_rate', ascending=False).head(15)
+    regional_feedback = regional_feedback.nlargest(15, 'unhelpful_rate').reset_index()
     
     if regional_feedback.empty:
         st.info("Insufficient feedback data for regional analysis")